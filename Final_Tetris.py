@@ -1,182 +1,71 @@
+# Import time module for the monotonic game clock and startup timings
+import time
+# Time the program started, used to measure the time to the first frame
+STARTED = time.perf_counter()
+# Import argparse for the command-line options
+import argparse
+# Import json for printing the profiling report
+import json
 # Import Tkinter library for GUI
 import tkinter as tk
-# Import random module for generating random values
-import random
+# Import queue for handing work between the Tk thread and the worker thread
+import queue
 # Import threading utilities
-from threading import Lock, Thread, Event
-# Import CSV module for handling CSV files
-import csv
-# Import pygame for handling music
-import pygame
-# Import messagebox module from Tkinter for displaying messages
-from tkinter import messagebox
-
-COLORS = ['gray', 'lightgreen', 'pink', 'blue', 'orange',
-          'purple']         # List of colors for tetrominos
-
-
-class Tetris():
-    # Height of the game field
-    FIELD_HEIGHT = 20
-    # Width of the game field
-    FIELD_WIDTH = 10
-    # Scores for eliminating lines
-    # Tetrominos represented as a list of coordinates
-    SCORE_PER_ELIMINATED_LINES = (0, 40, 100, 300, 1200)
-    TETROMINOS = [
-        [(0, 0), (0, 1), (1, 0), (1, 1)],                                   # O
-        [(0, 0), (0, 1), (1, 1), (2, 1)],                                   # L
-        [(0, 1), (1, 1), (2, 1), (2, 0)],                                   # J
-        [(0, 1), (1, 0), (1, 1), (2, 0)],                                   # Z
-        [(0, 1), (1, 0), (1, 1), (2, 1)],                                   # T
-        [(0, 0), (1, 0), (1, 1), (2, 1)],                                   # S
-        [(0, 1), (1, 1), (2, 1), (3, 1)],                                   # I
-    ]
-
-    # defining the initializing function
-    def __init__(self):
-        self.field = [[0 for c in range(Tetris.FIELD_WIDTH)]
-                      for r in range(Tetris.FIELD_HEIGHT)]                  # Initialize game field
-        # Initialize score
-        self.score = 0
-        # Initialize level
-        self.level = 0
-        # Initialize total lines eliminated
-        self.total_lines_eliminated = 0
-        # Initialize game over state
-        self.game_over = False
-        # Create lock for thread safety
-        self.move_lock = Lock()
-        # Reset tetromino to start the game
-        self.reset_tetromino()
-
-    # defining the reset_tetromino
-    def reset_tetromino(self):
-        # Choose a random tetromino
-        self.tetromino = random.choice(Tetris.TETROMINOS)[:]
-        # Choose a random color for tetromino
-        self.tetromino_color = random.randint(1, len(COLORS)-1)
-        # Set initial offset for tetromino
-        self.tetromino_offset = [-2, Tetris.FIELD_WIDTH//2]
-        self.game_over = any(not self.is_cell_free(r, c)
-                             for (r, c) in self.get_tetromino_coords())     # Check if game over
-
-    # defining the get_tetromino_coords
-    def get_tetromino_coords(self):
-        # Get coordinates of current tetromino
-        return [(r+self.tetromino_offset[0], c + self.tetromino_offset[1]) for (r, c) in self.tetromino]
-
-    def apply_tetromino(self):
-        # Apply tetromino to game field
-        for (r, c) in self.get_tetromino_coords():
-            self.field[r][c] = self.tetromino_color
-        # Get updated game field after eliminating lines
-        new_field = [row for row in self.field if any(
-            tile == 0 for tile in row)]
-        # Calculate lines eliminated
-        lines_eliminated = len(self.field)-len(new_field)
-        # Update total lines eliminated
-        self.total_lines_eliminated += lines_eliminated
-        # Update game field
-        self.field = [
-            [0]*Tetris.FIELD_WIDTH for x in range(lines_eliminated)] + new_field
-        # Update score
-        self.score += Tetris.SCORE_PER_ELIMINATED_LINES[lines_eliminated] * (
-            self.level + 1)
-        # Update level
-        self.level = self.total_lines_eliminated // 5
-        # Reset tetromino for next move
-        self.reset_tetromino()
-
-    # defining the get_colorfunction
-    def get_color(self, r, c):
-        # Get color of cell
-        return self.tetromino_color if (r, c) in self.get_tetromino_coords() else self.field[r][c]
-
-    # defining the is_cell_free function
-    def is_cell_free(self, r, c):
-        # Check if cell is free
-        return r < Tetris.FIELD_HEIGHT and 0 <= c < Tetris.FIELD_WIDTH and (r < 0 or self.field[r][c] == 0)
-
-    # defining the move function
-    def move(self, dr, dc):
-        # Acquire lock for thread safety
-        with self.move_lock:
-            # Check if game over
-            if self.game_over:
-                return
-            # Check if move is valid
-            if all(self.is_cell_free(r + dr, c + dc) for (r, c) in self.get_tetromino_coords()):
-                # Update tetromino offset
-                self.tetromino_offset = [
-                    self.tetromino_offset[0] + dr, self.tetromino_offset[1] + dc]
-            # If move is downwards
-            elif dr == 1 and dc == 0:
-                # Check if game over
-                self.game_over = any(r < 0 for (
-                    r, c) in self.get_tetromino_coords())
-                # If game is not over
-                if not self.game_over:
-                    # Apply tetromino to game field
-                    self.apply_tetromino()
-
-    # defining the rotate function
-    def rotate(self):
-        # Acquire lock for thread safety
-        with self.move_lock:
-            # If game over
-            if self.game_over:
-                # Reset game
-                self.__init__()
-                return
-
-            # Get y coordinates of tetromino
-            ys = [r for (r, c) in self.tetromino]
-            # Get x coordinates of tetromino
-            xs = [c for (r, c) in self.tetromino]
-            # Calculate size of tetromino
-            size = max(max(ys) - min(ys), max(xs)-min(xs))
-            # Calculate rotated tetromino
-            rotated_tetromino = [(c, size-r) for (r, c) in self.tetromino]
-            # Copy current offset
-            wallkick_offset = self.tetromino_offset[:]
-            tetromino_coord = [(r+wallkick_offset[0], c + wallkick_offset[1])
-                               for (r, c) in rotated_tetromino]  # Get coordinates of rotated tetromino
-            # Get minimum x coordinate
-            min_x = min(c for r, c in tetromino_coord)
-            # Get maximum x coordinate
-            max_x = max(c for r, c in tetromino_coord)
-            # Get maximum y coordinate
-            max_y = max(r for r, c in tetromino_coord)
-            # Adjust x offset
-            wallkick_offset[1] -= min(0, min_x)
-            # Adjust x offset
-            wallkick_offset[1] += min(0, Tetris.FIELD_WIDTH - (1 + max_x))
-            # Adjust y offset
-            wallkick_offset[0] += min(0, Tetris.FIELD_HEIGHT - (1 + max_y))
-
-            tetromino_coord = [(r+wallkick_offset[0], c + wallkick_offset[1])
-                               for (r, c) in rotated_tetromino]  # Get final coordinates
-            # Check if move is valid
-            if all(self.is_cell_free(r, c) for (r, c) in tetromino_coord):
-                # Update tetromino and offset
-                self.tetromino, self.tetromino_offset = rotated_tetromino, wallkick_offset
+from threading import Lock, Thread
+# Import traceback for logging failed background tasks
+import traceback
+# Import the headless game engine and its fixed-timestep loop
+from tetris_engine import COLORS, DOWN, DROP, LEFT, RIGHT, ROTATE, Tetris
+from game_loop import GameLoop
+# Import the leaderboard store
+from scores import SqliteScoreStore
+# Import the engine and renderer instrumentation
+from profiling import Profiler
+
+# Color of the cells where the tetromino would land
+GHOST_COLOR = 'dimgray'
+# Default size of a tetromino piece in pixels
+PIECE_SIZE = 30
+# Board render backends: one canvas rectangle per cell, or one image updated row by row
+RENDERERS = ('rectangles', 'image')
+# Milliseconds between two runs of the game clock
+FRAME_MS = 16
+# Milliseconds between two checks for finished background work
+WORKER_POLL_MS = 50
 
 
 # Define a class named Application inheriting from tk.Frame
 class Application(tk.Frame):
     # Define the initialization method of the class
-    def __init__(self, master=None, manager=None):
+    def __init__(self, master=None, manager=None, piece_size=PIECE_SIZE, renderer='rectangles',
+                 field_width=Tetris.FIELD_WIDTH, field_height=Tetris.FIELD_HEIGHT):
         # Call the initialization method of the superclass (tk.Frame)
         super().__init__(master)
+        # Set the size of a tetromino piece and the board render backend
+        self.piece_size = piece_size
+        self.renderer = renderer
+        # Set the size of the game field
+        self.field_size = (field_width, field_height)
         # Create an instance of the Tetris class
-        self.tetris = Tetris()
+        self.tetris = Tetris(width=self.field_size[0], height=self.field_size[1])
+        # Create the fixed-timestep loop driving the game
+        self.loop = GameLoop(self.tetris, time.monotonic())
+        # Pending key release callbacks, used to ignore the keyboard's auto-repeat
+        self.releases = {}
         # Initialize the manager attribute with the provided manager parameter
         self.manager = manager
+        # Report engine calls and frame timings if profiling is enabled
+        if self.manager.profiler:
+            self.manager.profiler.attach(self.tetris)
+            self.manager.profiler.attach_renderer(self)
         # Use the pack geometry manager to organize the widgets in the window
         self.pack()
         # Call the create_widgets method to create GUI elements
         self.create_widgets()
+        # Draw the first frame right away
+        self.update()
+        # Record the first frame once Tk has drawn it
+        self.after_idle(self.manager.record_startup, 'first_frame')
         # Call the update_clock method to start the game clock
         self.update_clock()
 
@@ -188,39 +77,53 @@ class Application(tk.Frame):
     # Define a method to update the game clock
     def update_clock(self):
         # Check if the game is not paused
-        if not self.manager.pause_event.is_set():
-            # Move the tetromino down by one unit
-            self.tetris.move(1, 0)
-            # Update the GUI
-            self.update()
-        # Schedule the next clock update
-        self.master.after(
-            int(1000*(0.66**self.tetris.level)), self.update_clock)
-        # Check if the game is paused
+        if not self.manager.game_paused:
+            # Run the sub-steps due since the last clock update and update the GUI if the game changed
+            if self.loop.advance(time.monotonic()):
+                self.update()
+        else:
+            # Drop the paused time so the game does not catch up afterwards
+            self.loop.skip(time.monotonic())
+        # Schedule the next clock update (the only pending one)
+        self.master.after(FRAME_MS, self.update_clock)
+
+    # Define a method to handle a key press
+    def key_press(self, action):
+        # Ignore the game keys while the game is paused
         if self.manager.game_paused:
-            # Schedule another clock update after 100 milliseconds
-            self.after(100, self.update_clock)
-            # Exit the method
             return
+        # A press right after a release is the keyboard's auto-repeat, so the key is still held
+        if action in self.releases:
+            self.after_cancel(self.releases.pop(action))
+            return
+        # Apply the action through the game loop
+        self.loop.press(action)
+        # Update the GUI
+        self.update()
+
+    # Define a method to handle a key release
+    def key_release(self, action):
+        # Release the key shortly afterwards unless the auto-repeat presses it again
+        self.releases[action] = self.after(30, self.release_key, action)
+
+    # Define a method to release a held key
+    def release_key(self, action):
+        # Forget the pending release and stop the key repeat
+        self.releases.pop(action, None)
+        self.loop.release(action)
 
     # Define a method to create GUI widgets
     def create_widgets(self):
-        # Define the size of a tetromino piece
-        PIECE_SIZE = 30
-        self.canvas = tk.Canvas(self, height=PIECE_SIZE*self.tetris.FIELD_HEIGHT, width=PIECE_SIZE *
-                                self.tetris.FIELD_WIDTH, bg="black", bd=0)    # Create a canvas widget
-        # Bind left arrow key to move left
-        self.canvas.bind('<Left>', lambda _: (
-            self.tetris.move(0, -1), self.update()))
-        # Bind right arrow key to move right
-        self.canvas.bind('<Right>', lambda _: (
-            self.tetris.move(0, 1), self.update()))
-        # Bind down arrow key to move down
-        self.canvas.bind('<Down>', lambda _: (
-            self.tetris.move(1, 0), self.update()))
-        # Bind up arrow key to rotate tetromino
-        self.canvas.bind('<Up>', lambda _: (
-            self.tetris.rotate(), self.update()))
+        # Get the size of a tetromino piece
+        size = self.piece_size
+        self.canvas = tk.Canvas(self, height=size*self.tetris.height, width=size *
+                                self.tetris.width, bg="black", bd=0, highlightthickness=0)    # Create a canvas widget
+        # Bind arrow keys to move left, right and down and to rotate the tetromino
+        for key, action in (('Left', LEFT), ('Right', RIGHT), ('Down', DOWN), ('Up', ROTATE)):
+            self.canvas.bind('<KeyPress-{}>'.format(key),
+                             lambda _, action=action: self.key_press(action))
+            self.canvas.bind('<KeyRelease-{}>'.format(key),
+                             lambda _, action=action: self.key_release(action))
         # Bind 'p' key to toggle pause
         self.canvas.bind('<p>', lambda _: self.manager.toggle_pause())
         # Bind space key to instant drop
@@ -229,11 +132,33 @@ class Application(tk.Frame):
         self.canvas.bind('<r>', lambda _: self.restart_game())
         # Set focus to the canvas widget
         self.canvas.focus_set()
-        self.rectangles = [                                                                               # Create rectangles representing the game field
-            self.canvas.create_rectangle(
-                c*PIECE_SIZE, r*PIECE_SIZE, (c+1)*PIECE_SIZE, (r+1)*PIECE_SIZE)
-            for r in range(self.tetris.FIELD_HEIGHT) for c in range(self.tetris.FIELD_WIDTH)
+        # Number of cells of the game field
+        self.cell_count = self.tetris.height * self.tetris.width
+        if self.renderer == 'image':
+            # Create one image holding the whole game field
+            self.image = tk.PhotoImage(
+                width=size*self.tetris.width, height=size*self.tetris.height)
+            self.canvas.create_image(0, 0, anchor='nw', image=self.image)
+            # Pre-rendered pixel rows of one cell per color, filled in on first use
+            self.tiles = {}
+        else:
+            self.rectangles = [                                                                           # Create rectangles representing the game field
+                self.canvas.create_rectangle(
+                    c*size, r*size, (c+1)*size, (r+1)*size)
+                for r in range(self.tetris.height) for c in range(self.tetris.width)
+            ]
+        # Create the pause overlay, hidden until the game is paused
+        self.pause_overlay = [
+            self.canvas.create_rectangle(0, 0, size*self.tetris.width, size*self.tetris.height,
+                                         fill='black', stipple='gray50', state='hidden'),
+            self.canvas.create_text(size*self.tetris.width//2, size*self.tetris.height//2,
+                                    text="PAUSED\npress p to continue", fill='white', justify='center',
+                                    font=("Courier", 16), state='hidden'),
         ]
+        # Colors last drawn on each rectangle (None forces a full repaint)
+        self.drawn = None
+        # Score, level and game over state last shown in the labels
+        self.drawn_status = None
         # Pack the canvas widget to the left side of the window
         self.canvas.pack(side="left")
         # Create a label widget for status message
@@ -257,72 +182,168 @@ class Application(tk.Frame):
         # Set focus to the canvas widget
         self.canvas.focus_set()
 
+    # Define a method to show or hide the pause overlay
+    def show_pause(self, paused):
+        # Set the state of the overlay items
+        for item in self.pause_overlay:
+            self.canvas.itemconfig(item, state='normal' if paused else 'hidden')
+
     # Define a method to restart the game
     def restart_game(self):
         # Create a new instance of Tetris
-        self.tetris = Tetris()
+        self.tetris = Tetris(width=self.field_size[0], height=self.field_size[1])
+        # Keep profiling the new game
+        if self.manager.profiler:
+            self.manager.profiler.attach(self.tetris)
+        # Drive the new game with a fresh loop
+        self.loop = GameLoop(self.tetris, time.monotonic())
+        # Forget the drawn colors so the next update repaints every cell
+        self.drawn = None
         # Update the GUI to reflect the new game state
         self.update()
 
     # Define a method to update the GUI
     def update(self):
-        # Iterate over the rectangles representing the game field
-        for i, _id in enumerate(self.rectangles):
+        # Get the game field width
+        width = self.tetris.width
+        # Get the cell indices covered by the visible part of the tetromino
+        piece = {r*width + c for (r, c)
+                 in self.tetris.get_tetromino_coords() if r >= 0}
+        # Get the cell indices where the tetromino would land
+        ghost = set() if self.tetris.game_over else {
+            r*width + c for (r, c) in self.tetris.ghost_piece() if r >= 0}
+        # Repaint every cell after a restart or a line clear
+        if self.drawn is None or self.drawn_lines != self.tetris.total_lines_eliminated:
+            self.drawn = [None] * self.cell_count
+            dirty = range(self.cell_count)
+        # Check every cell when a tetromino was placed since the last update
+        elif self.drawn_field != self.tetris.colors:
+            dirty = range(self.cell_count)
+        # Otherwise only the cells under the old and new tetromino can change
+        else:
+            dirty = self.drawn_piece | piece | self.drawn_ghost | ghost
+        # Collect the cells whose color differs from the drawn one
+        changed = []
+        # Iterate over the cells that may have changed
+        for i in dirty:
             # Get the color of the current cell
-            color_num = self.tetris.get_color(
-                i//self.tetris.FIELD_WIDTH, i % self.tetris.FIELD_WIDTH)
-            # Update the color of the rectangle
-            self.canvas.itemconfig(_id, fill=COLORS[color_num])
-
-        self.status_msg['text'] = "Score: {}\nLevel: {}".format(
-            self.tetris.score, self.tetris.level)     # Update the status message
-        # Update the game over message
-        self.game_over_msg['text'] = "GAME OVER.\nPress UP\nto reset" if self.tetris.game_over else ""
+            if i in piece:
+                color = COLORS[self.tetris.tetromino_color]
+            elif i in ghost and not self.tetris.colors[i]:
+                color = GHOST_COLOR
+            else:
+                color = COLORS[self.tetris.colors[i]]
+            # Remember the cell if its color differs from the drawn one
+            if self.drawn[i] != color:
+                self.drawn[i] = color
+                changed.append(i)
+        # Push the changed cells to the render backend
+        if changed:
+            if self.renderer == 'image':
+                self.paint_rows(changed)
+            else:
+                self.paint_rectangles(changed)
+        # Remember what was drawn
+        self.drawn_piece = piece
+        self.drawn_ghost = ghost
+        self.drawn_field = bytes(self.tetris.colors)
+        self.drawn_lines = self.tetris.total_lines_eliminated
+
+        # Update the status and game over messages only when they change
+        status = (self.tetris.score, self.tetris.level, self.tetris.game_over)
+        if self.drawn_status != status:
+            self.status_msg['text'] = "Score: {}\nLevel: {}".format(
+                self.tetris.score, self.tetris.level)     # Update the status message
+            # Update the game over message
+            self.game_over_msg['text'] = "GAME OVER.\nPress UP\nto reset" if self.tetris.game_over else ""
+            self.drawn_status = status
+
+    # Define a method to paint changed cells as canvas rectangles
+    def paint_rectangles(self, changed):
+        # Update the color of each changed rectangle
+        for i in changed:
+            self.canvas.itemconfig(self.rectangles[i], fill=self.drawn[i])
+
+    # Define a method to get the pre-rendered pixel rows of a cell
+    def tile(self, color):
+        # Render the tile the first time the color is used
+        if color not in self.tiles:
+            # Convert the color name to a hex pixel value
+            pixel = '#%02x%02x%02x' % tuple(
+                value // 256 for value in self.winfo_rgb(color))
+            # Top pixel row is the black border, the others start with a border pixel
+            self.tiles[color] = ('#000000 ' * self.piece_size,
+                                 '#000000 ' + (pixel + ' ') * (self.piece_size - 1))
+        return self.tiles[color]
+
+    # Define a method to paint changed cells into the field image
+    def paint_rows(self, changed):
+        # Get the game field width and the size of a tetromino piece
+        width = self.tetris.width
+        size = self.piece_size
+        # Redraw each row holding a changed cell with a single put
+        for r in sorted({i // width for i in changed}):
+            tiles = [self.tile(color) for color in self.drawn[r*width:(r+1)*width]]
+            # Join the tile strips into the pixel rows of the whole field row
+            border = '{' + ''.join(tile[0] for tile in tiles) + '} '
+            body = '{' + ''.join(tile[1] for tile in tiles) + '} '
+            self.image.put(border + body * (size - 1), to=(0, r*size))
 
     # Define a method to perform an instant drop
     def instant_drop(self):
-        # Loop until the game is paused
-        while not self.manager.pause_event.is_set():
-            # Check if the game is over
-            if self.tetris.game_over:
-                # Exit the loop
-                break
-            # Check if all cells below the tetromino are free
-            if all(self.tetris.is_cell_free(r + 1, c) for (r, c) in self.tetris.get_tetromino_coords()):
-                # Move the tetromino down by one unit
-                self.tetris.move(1, 0)
-                # Update the GUI
-                self.update()
-            else:
-                # Exit the loop
-                break
+        # Check if the game is running
+        if not self.manager.game_paused:
+            # Drop the tetromino to its landing row and lock it
+            self.loop.press(DROP)
+            # Update the GUI
+            self.update()
 
 
 # creating a class name musicplayer
 class MusicPlayer:
     def __init__(self, music_file):
-        # Initialize pygame mixer
-        pygame.mixer.init()
         # Set the music file
-        self.music_file = "Tetris.mp3"
-        # Initialize playing state
+        self.music_file = music_file
+        # Initialize playing state (music starts once it is loaded)
         self.is_playing = False
+        # Mixer module, set once the music is loaded in the background
+        self.mixer = None
+        # Create lock for thread safety
+        self.lock = Lock()
+
+    # defining the load function
+    def load(self):
+        try:
+            # Import pygame, open the audio device and decode the music file
+            import pygame
+            pygame.mixer.init()
+            pygame.mixer.music.load(self.music_file)
+        except Exception:
+            # Stay silent without pygame, audio device or music file
+            return
+        with self.lock:
+            # Keep the mixer and start the music if it was requested while loading
+            self.mixer = pygame.mixer
+            if self.is_playing:
+                self.mixer.music.play(-1)
 
     # defining the start_music function
     def start_music(self):
-        # Load music file
-        pygame.mixer.music.load(self.music_file)
-        # Play music indefinitely
-        pygame.mixer.music.play(-1)
-        # Update playing state
-        self.is_playing = True
+        with self.lock:
+            # Play music indefinitely once it is loaded
+            if self.mixer:
+                self.mixer.music.play(-1)
+            # Update playing state
+            self.is_playing = True
 
     # defining the stop_music function
     def stop_music(self):
-        # Stop music playback
-        pygame.mixer.music.stop()
-        # Update playing state
-        self.is_playing = False
+        with self.lock:
+            # Stop music playback
+            if self.mixer:
+                self.mixer.music.stop()
+            # Update playing state
+            self.is_playing = False
 
     # defining the toggle_music function
     def toggle_music(self):
@@ -339,141 +360,178 @@ class MusicPlayer:
 # creating a class name threadmanager
 class ThreadManager:
     # defining the initialization function
-    def __init__(self):
+    def __init__(self, profiler=None, piece_size=PIECE_SIZE, renderer='rectangles',
+                 field_width=Tetris.FIELD_WIDTH, field_height=Tetris.FIELD_HEIGHT):
+        # Initialize the optional profiler shared with the application
+        self.profiler = profiler
+        # Initialize the size of a tetromino piece and the board render backend
+        self.piece_size = piece_size
+        self.renderer = renderer
+        # Initialize the size of the game field
+        self.field_size = (field_width, field_height)
         # Initialize player name
         self.player_name = None
-        # Initialize application instance
+        # Initialize the single Tk root and the application instance
+        self.root = None
         self.app = None
-        # Initialize score data list
-        self.score_data = []
+        # Open the leaderboard (the old scores.csv file is imported in the background)
+        self.score_store = SqliteScoreStore('scores.db')
+        # Initialize startup timings in seconds since the program started
+        self.startup_times = {}
         # Initialize game running state
         self.game_running = False
         # Initialize game paused state
         self.game_paused = False
-        # Initialize thread lock
-        self.thread_lock = Lock()
-        # Initialize game thread
-        self.game_thread = None
-        # Initialize event for name entry
-        self.name_entered = Event()
         # Initialize music player
         self.music_player = MusicPlayer('Tetris.mp3')
-        # Create threads for various tasks
-        self.create_threads()
-        # Initialize event for pausing the game
-        self.pause_event = Event()
-        # Set the pause event to allow starting the game
-        self.pause_event.set()
-
-    # defining the create_threads function
-    def create_threads(self):
-        # Thread for getting player name
-        self.thread1 = Thread(target=self.get_player_name)
-        # Thread for starting the game
-        self.thread2 = Thread(target=self.start_game)
-        # Thread for toggling pause
-        self.thread3 = Thread(target=self.toggle_pause)
-        # Thread for starting music
-        self.thread4 = Thread(target=self.music_player.start_music)
+        # Background tasks and the callbacks to run on the Tk thread once they finish
+        self.tasks = queue.Queue()
+        self.callbacks = queue.Queue()
+        # Create the worker thread running the background tasks in order
+        self.worker = Thread(target=self.run_tasks, daemon=True)
+
+    # defining the submit function
+    def submit(self, task, *args, callback=None):
+        # Queue a background task; its callback later runs on the Tk thread with the result
+        self.tasks.put((task, args, callback))
+
+    # defining the run_tasks function
+    def run_tasks(self):
+        # Run background tasks one at a time on the worker thread
+        while True:
+            task, args, callback = self.tasks.get()
+            # Log a failed task and keep the worker running for the next one;
+            # its callback still runs (with None) so the Tk thread never waits forever
+            try:
+                result = task(*args)
+            except Exception:
+                traceback.print_exc()
+                result = None
+            if callback:
+                self.callbacks.put((callback, result))
+
+    # defining the drain_callbacks function
+    def drain_callbacks(self):
+        # Run the callbacks of finished background tasks on the Tk thread
+        while not self.callbacks.empty():
+            callback, result = self.callbacks.get()
+            callback(result)
+        # Check again later
+        self.root.after(WORKER_POLL_MS, self.drain_callbacks)
 
     def get_player_name(self):
-        # Create Tkinter root window
-        root = tk.Tk()
         # Set window title
-        root.title("Tetris")
+        self.root.title("Tetris")
         # Center the window on the screen
-        self.center_window(root, 300, 150)
+        self.center_window(self.root, 300, 150)
+        # Create the frame holding the name entry
+        self.name_frame = tk.Frame(self.root)
+        # Pack the frame into the window
+        self.name_frame.pack()
         # Create label for name entry
-        label = tk.Label(root, text="Enter your name:")
-        # Pack the label into the window
+        label = tk.Label(self.name_frame, text="Enter your name:")
+        # Pack the label into the frame
         label.pack()
         # Create entry widget for name input
-        entry = tk.Entry(root)
-        # Pack the entry widget into the window
+        entry = tk.Entry(self.name_frame)
+        # Pack the entry widget into the frame
         entry.pack()
-        button = tk.Button(root, text="Submit", command=lambda: self.submit_name(
-            root, entry))            # Create submit button
-        # Pack the button into the window
+        # Submit the name with the Return key too
+        entry.bind('<Return>', lambda _: self.submit_name(entry))
+        entry.focus_set()
+        button = tk.Button(self.name_frame, text="Submit", command=lambda: self.submit_name(
+            entry))            # Create submit button
+        # Pack the button into the frame
         button.pack()
-        # Start the Tkinter event loop for name entry
-        root.mainloop()
+        # Record the name dialog once Tk has drawn it
+        self.root.after_idle(self.record_startup, 'name_dialog')
 
     # defining the submit_name function
-    def submit_name(self, root, entry):
+    def submit_name(self, entry):
         # Get entered name
         entered_name = entry.get().strip()
         # Use entered name or set to Guest
         self.player_name = entered_name if entered_name else "Guest"
-        # Destroy the name entry window
-        root.destroy()
-        # Set event indicating name entry is done
-        self.name_entered.set()
+        # Record when the name was submitted
+        self.record_startup('name_submitted')
+        # Swap the name entry frame for the game
+        self.name_frame.destroy()
+        self.start_game()
 
     # defining the start_name function
     def start_game(self):
-        # Wait for player name to be entered
-        self.name_entered.wait()
         # Set game running state to True
         self.game_running = True
-        # Create Tkinter root window for the game
-        root = tk.Tk()
+        # Let the window fit the game
+        self.root.geometry('')
         # Create instance of Application class
-        self.app = Application(master=root, manager=self)
-        # Start the Tkinter event loop for the game
-        self.app.mainloop()
-        # Set game running state to False when game ends
-        self.game_running = False
+        self.app = Application(master=self.root, manager=self,
+                               piece_size=self.piece_size, renderer=self.renderer,
+                               field_width=self.field_size[0], field_height=self.field_size[1])
+        # Start the music (it plays as soon as it is loaded)
+        self.music_player.start_music()
 
     # defining the toggle_pause function
     def toggle_pause(self):
-        # Check if game is not paused
-        if self.pause_event.is_set():
-            # Clear pause event to pause the game
-            self.pause_event.clear()
-            # Toggle music playback
-            self.music_player.toggle_music()
-        # the if condition is wrong then it will run else
-        else:
-            # Set pause event to resume the game
-            self.pause_event.set()
-            # Toggle music playback
-            self.music_player.toggle_music()
-            messagebox.showinfo(
-                "Game Paused", "Game Paused. Close the messagebox and press 'p' again to continue.")      # Display pause message
+        # Toggle game paused state
+        self.game_paused = not self.game_paused
+        # Stop the key repeat of keys held when pausing
+        if self.game_paused:
+            self.app.loop.held.clear()
+        # Toggle music playback
+        self.music_player.toggle_music()
+        # Show or hide the pause overlay
+        self.app.show_pause(self.game_paused)
 
     def save_score_data(self, score):  # defining the save_score_data function
-        # Add player name and score to score data list
-        self.score_data.append((self.player_name, score))
-        # Open CSV file for appending
-        with open('scores.csv', 'a', newline='') as file:
-            # Create CSV writer
-            writer = csv.writer(file)
-            # Write player name and score to CSV
-            writer.writerow((self.player_name, score))
+        # Save player name and score to the leaderboard, logging a failed save
+        try:
+            self.score_store.add(self.player_name, score)
+        except Exception:
+            traceback.print_exc()
+
+    # defining the record_startup function
+    def record_startup(self, name):
+        # Record a startup milestone
+        self.startup_times[name] = time.perf_counter() - STARTED
+        # Report the time to the first frame, excluding the time spent typing the name
+        if name == 'first_frame':
+            print("Time to name dialog: {:.0f} ms, time to first frame after name entry: {:.0f} ms".format(
+                1000 * self.startup_times.get('name_dialog', 0),
+                1000 * (self.startup_times['first_frame'] - self.startup_times.get('name_submitted', 0))))
 
     # defining the exit_and_save function
     def exit_and_save(self):
         # Check if game is running
         if self.game_running:
-            # Get current score
-            current_score = self.app.get_current_score()
-            # Save current score
-            self.save_score_data(current_score)
             # Set game running state to False
             self.game_running = False
-            # Destroy the game window
-            self.app.master.after(0, self.app.master.destroy)
+            # Save current score on the worker thread (after any queued task, such as a running
+            # scores.csv import), then destroy the window from the Tk thread
+            self.submit(self.save_score_data, self.app.get_current_score(),
+                        callback=lambda _: self.root.destroy())
+            # Print the profiling report
+            if self.profiler:
+                print(json.dumps(dict(self.profiler.report(),
+                                      startup_seconds=self.startup_times), indent=2))
 
     # defining the run function
     def run(self):
-        # Start thread for getting player name
-        self.thread1.start()
-        # Start thread for starting the game
-        self.thread2.start()
-        # Start thread for toggling pause
-        self.thread3.start()
-        # Start thread for starting music
-        self.thread4.start()
+        # Create the single Tk root on the main thread
+        self.root = tk.Tk()
+        # Load the music on its own thread, since opening a broken audio device can hang
+        Thread(target=self.music_player.load, daemon=True).start()
+        # Start the worker thread and queue the old scores import
+        self.worker.start()
+        self.submit(self.score_store.import_csv, 'scores.csv')
+        # Start checking for finished background work
+        self.root.after(WORKER_POLL_MS, self.drain_callbacks)
+        # Show the name entry
+        self.get_player_name()
+        # Start the Tkinter event loop
+        self.root.mainloop()
+        # Set game running state to False when the window closes
+        self.game_running = False
 
     # defining the center_window function
     def center_window(self, window, window_width, window_height):
@@ -491,7 +549,21 @@ class ThreadManager:
 
 # check if the script is being run directly
 if __name__ == "__main__":
+    # Parse the command-line options
+    parser = argparse.ArgumentParser(description="Play Tetris.")
+    parser.add_argument('--profile', action='store_true',
+                        help="print engine and frame timings when quitting with q")
+    parser.add_argument('--piece-size', type=int, default=PIECE_SIZE,
+                        help="size of a cell in pixels")
+    parser.add_argument('--renderer', choices=RENDERERS, default='rectangles',
+                        help="draw the board as canvas rectangles or as one image")
+    parser.add_argument('--width', type=int, default=Tetris.FIELD_WIDTH,
+                        help="number of columns of the game field")
+    parser.add_argument('--height', type=int, default=Tetris.FIELD_HEIGHT,
+                        help="number of rows of the game field")
+    args = parser.parse_args()
     # calling the threadmanager
-    manager = ThreadManager()
+    manager = ThreadManager(Profiler(keep_samples=True) if args.profile else None,
+                            args.piece_size, args.renderer, args.width, args.height)
     # will call the run method
     manager.run()
@@ -0,0 +1,278 @@
+# Import argparse for the command-line interface
+import argparse
+# Import json for writing the benchmark suite results
+import json
+# Import random module for generating the input script
+import random
+# Import time module for measuring throughput
+import time
+# Import lock for the thread-safe moves of the original engine
+from threading import Lock
+# Import the bitboard engine and its action codes
+from tetris_engine import DOWN, DROP, LEFT, RIGHT, ROTATE, Tetris
+# Import the engine instrumentation
+from profiling import Profiler
+# Import the greedy bot
+from simulate import greedy_policy
+
+
+# creating a class name legacytetris
+class LegacyTetris(Tetris):
+    # List-of-lists reference engine used as the "before" baseline
+
+    # defining the initializing function
+    def __init__(self, seed=None, bag=False):
+        # Initialize game field as a list of rows of cell colors
+        self.legacy_field = [[0 for c in range(Tetris.FIELD_WIDTH)]
+                             for r in range(Tetris.FIELD_HEIGHT)]
+        # Create lock for thread safety, as the original engine took it on every move
+        self.move_lock = Lock()
+        # Initialize the engine state
+        super().__init__(seed, bag)
+
+    # defining the field property
+    @property
+    def field(self):
+        # Return the list-of-lists field
+        return self.legacy_field
+
+    # defining the fits function
+    def fits(self, row, col, geometry=None):
+        # Check every cell of the current tetromino one by one
+        return all(self.is_cell_free(r + row, c + col) for (r, c) in self.tetromino)
+
+    # defining the is_cell_free function
+    def is_cell_free(self, r, c):
+        # Check if cell is free
+        return r < Tetris.FIELD_HEIGHT and 0 <= c < Tetris.FIELD_WIDTH and (r < 0 or self.legacy_field[r][c] == 0)
+
+    # defining the apply_tetromino function
+    def apply_tetromino(self):
+        # Apply tetromino to game field
+        for (r, c) in self.get_tetromino_coords():
+            self.legacy_field[r][c] = self.tetromino_color
+        # Get updated game field after eliminating lines
+        new_field = [row for row in self.legacy_field if any(
+            tile == 0 for tile in row)]
+        # Calculate lines eliminated
+        lines_eliminated = len(self.legacy_field)-len(new_field)
+        # Update total lines eliminated
+        self.total_lines_eliminated += lines_eliminated
+        # Update game field
+        self.legacy_field = [
+            [0]*Tetris.FIELD_WIDTH for x in range(lines_eliminated)] + new_field
+        # Update score
+        self.score += Tetris.SCORE_PER_ELIMINATED_LINES[lines_eliminated] * (
+            self.level + 1)
+        # Update level
+        self.level = self.total_lines_eliminated // 5
+        # Reset tetromino for next move
+        self.reset_tetromino()
+
+    # defining the move function
+    def move(self, dr, dc):
+        # Acquire lock for thread safety
+        with self.move_lock:
+            # Check if game over
+            if self.game_over:
+                return
+            # Check if move is valid
+            if all(self.is_cell_free(r + dr, c + dc) for (r, c) in self.get_tetromino_coords()):
+                # Update tetromino offset
+                self.tetromino_offset = [
+                    self.tetromino_offset[0] + dr, self.tetromino_offset[1] + dc]
+            # If move is downwards
+            elif dr == 1 and dc == 0:
+                # Check if game over
+                self.game_over = any(r < 0 for (
+                    r, c) in self.get_tetromino_coords())
+                # If game is not over
+                if not self.game_over:
+                    # Apply tetromino to game field
+                    self.apply_tetromino()
+
+    # defining the get_color function
+    def get_color(self, r, c):
+        # Get color of cell
+        return self.tetromino_color if (r, c) in self.get_tetromino_coords() else self.legacy_field[r][c]
+
+    # defining the rotate function
+    def rotate(self):
+        # If game over
+        if self.game_over:
+            # Reset game
+            self.__init__(self.rng.getrandbits(64), self.bag)
+            return
+        # Calculate size of tetromino
+        ys = [r for (r, c) in self.tetromino]
+        xs = [c for (r, c) in self.tetromino]
+        size = max(max(ys) - min(ys), max(xs)-min(xs))
+        # Calculate rotated tetromino
+        rotated_tetromino = [(c, size-r) for (r, c) in self.tetromino]
+        # Calculate the wall-kick offset
+        wallkick_offset = self.tetromino_offset[:]
+        tetromino_coord = [(r+wallkick_offset[0], c + wallkick_offset[1])
+                           for (r, c) in rotated_tetromino]
+        min_x = min(c for r, c in tetromino_coord)
+        max_x = max(c for r, c in tetromino_coord)
+        max_y = max(r for r, c in tetromino_coord)
+        wallkick_offset[1] -= min(0, min_x)
+        wallkick_offset[1] += min(0, Tetris.FIELD_WIDTH - (1 + max_x))
+        wallkick_offset[0] += min(0, Tetris.FIELD_HEIGHT - (1 + max_y))
+        tetromino_coord = [(r+wallkick_offset[0], c + wallkick_offset[1])
+                           for (r, c) in rotated_tetromino]
+        # Check if move is valid
+        if all(self.is_cell_free(r, c) for (r, c) in tetromino_coord):
+            # Update tetromino and offset
+            self.set_tetromino(self.shape, (self.rotation + 1) % 4)
+            self.tetromino_offset = wallkick_offset
+
+
+# defining the make_script function
+def make_script(length, seed=0):
+    # Build a fixed input script of moves and rotations
+    rng = random.Random(seed)
+    return [rng.choice(((0, -1), (0, 1), (1, 0), (1, 0), None)) for _ in range(length)]
+
+
+# defining the run_script function
+def run_script(engine_class, script, seed=0):
+    # Create the game with a fixed seed so both engines see the same pieces
+    game = engine_class(seed)
+    # Start timing
+    start = time.perf_counter()
+    for action in script:
+        # Restart finished games
+        if game.game_over:
+            game = engine_class(seed)
+        # Rotate or move the tetromino
+        if action is None:
+            game.rotate()
+        else:
+            game.move(*action)
+    # Return moves per second
+    return len(script) / (time.perf_counter() - start)
+
+
+# defining the run_inputs function
+def run_inputs(profiler, length, seed=0, frame_every=10):
+    # Replay a fixed seeded script of action codes, reading the whole board like a renderer every few inputs
+    rng = random.Random(seed)
+    script = [rng.choice((LEFT, RIGHT, DOWN, DOWN, ROTATE, DROP)) for _ in range(length)]
+    game = profiler.attach(Tetris(seed))
+    for i, action in enumerate(script):
+        # Restart finished games
+        if game.game_over:
+            game = profiler.attach(Tetris(seed + i))
+        game.play(action)
+        if i % frame_every == 0:
+            for r in range(Tetris.FIELD_HEIGHT):
+                for c in range(Tetris.FIELD_WIDTH):
+                    game.get_color(r, c)
+    return length
+
+
+# defining the run_placements function
+def run_placements(profiler, pieces, seed=0):
+    # Let the greedy bot place a fixed number of tetrominos from a seeded game
+    game = profiler.attach(Tetris(seed))
+    for i in range(pieces):
+        # Restart finished games
+        if game.game_over:
+            game = profiler.attach(Tetris(seed + i))
+        game.apply_placement(greedy_policy(game))
+    return pieces
+
+
+# defining the suite function
+def suite(path, length=100000, pieces=500):
+    # Run every scenario with its own profiler and collect the results
+    results = {}
+    for name, scenario, size in (('inputs', run_inputs, length), ('placements', run_placements, pieces)):
+        profiler = Profiler(keep_samples=True)
+        start = time.perf_counter()
+        count = scenario(profiler, size)
+        elapsed = time.perf_counter() - start
+        results[name] = dict(profiler.report(), steps=count, seconds=elapsed,
+                             steps_per_second=count / elapsed)
+    # Write the results to JSON
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+    return results
+
+
+# defining the run_scaling function
+def run_scaling(width, height, pieces=2000, seed=0):
+    # Time collision checks over a seeded input script on a field of the given size
+    profiler = Profiler()
+    run = random.Random(seed)
+    game = profiler.attach(Tetris(seed, width=width, height=height))
+    for i in range(pieces * 10):
+        if game.game_over:
+            game = profiler.attach(Tetris(seed + i, width=width, height=height))
+        game.play(run.choice((LEFT, RIGHT, DOWN, ROTATE)))
+    collision_ns = profiler.nanoseconds['fits'] / profiler.calls['fits']
+    # Time four-line clears: fill the bottom four rows except column 0 and drop a vertical I into the gap
+    game = Tetris(seed, width=width, height=height)
+    filled = ((1 << 4) - 1) << (height - 4)
+    total = 0
+    for _ in range(pieces):
+        for r in range(height - 4, height):
+            game.rows[r] = game.full_row & ~1
+            game.colors[r*width + 1:(r+1)*width] = bytes([1]) * (width - 1)
+        game.columns[1:] = [column | filled for column in game.columns[1:]]
+        game.set_tetromino(len(Tetris.TETROMINOS) - 1, 0)
+        game.tetromino_offset = [-2, -1]
+        start = time.perf_counter_ns()
+        game.hard_drop()
+        total += time.perf_counter_ns() - start
+    return collision_ns, total / pieces
+
+
+# defining the scaling function
+def scaling(sizes=((10, 20), (10, 400), (40, 20), (40, 400))):
+    # Show how collision and line clear costs per piece change with the field height and width
+    print("{:>10} {:>16} {:>22}".format("field", "collision ns", "4-line drop+clear ns"))
+    for width, height in sizes:
+        collision_ns, clear_ns = run_scaling(width, height)
+        print("{:>10} {:>16.0f} {:>22.0f}".format("{}x{}".format(width, height), collision_ns, clear_ns))
+
+
+# defining the compare function
+def compare(length=200000):
+    # Build the shared input script
+    script = make_script(length)
+    # Measure the list-of-lists engine
+    before = run_script(LegacyTetris, script)
+    # Measure the bitboard engine
+    after = run_script(Tetris, script)
+    # Report the results
+    print("list-of-lists field: {:>12,.0f} moves/sec".format(before))
+    print("bitboard field:      {:>12,.0f} moves/sec".format(after))
+    print("speedup:             {:>12.2f}x".format(after / before))
+
+
+# defining the main function
+def main(argv=None):
+    # Parse the command-line arguments
+    parser = argparse.ArgumentParser(description="Benchmark the Tetris engine.")
+    parser.add_argument('--json', metavar='PATH', default=None,
+                        help="run the seeded benchmark suite and write throughput and latency percentiles here")
+    parser.add_argument('--scaling', action='store_true',
+                        help="measure collision and line clear costs on growing fields")
+    args = parser.parse_args(argv)
+    # Run the suite, the scaling benchmark or the before/after comparison
+    if args.scaling:
+        scaling()
+    elif args.json:
+        results = suite(args.json)
+        for name, result in results.items():
+            print("{:<12} {:>12,.0f} steps/sec".format(name, result['steps_per_second']))
+    else:
+        compare()
+
+
+# check if the script is being run directly
+if __name__ == "__main__":
+    # run the benchmark
+    main()
@@ -0,0 +1,228 @@
+# Import argparse for the command-line interface
+import argparse
+# Import json for the dataset description
+import json
+# Import os for the dataset files
+import os
+# Import random module for seeding the policies
+import random
+# Import NumPy for the fixed-layout, memory-mapped record files
+import numpy as np
+# Import the headless game engine
+from tetris_engine import Tetris
+# Import the placement action code and the replay reader
+from replay import PLACE, read_replay
+# Import the bot policies
+from simulate import load_policy, POLICIES
+
+# Files of a dataset directory
+RECORDS_FILE = 'records.bin'
+INDEX_FILE = 'index.bin'
+META_FILE = 'meta.json'
+# Version of the record layout, stored in meta.json (version 1 had no rotation and offset
+# of the falling tetromino)
+FORMAT_VERSION = 2
+# One entry per game: first record, number of records, seed and final score
+INDEX_DTYPE = np.dtype([('start', '<u8'), ('length', '<u4'), ('seed', '<u8'), ('score', '<u4')])
+
+
+# defining the record_dtype function
+def record_dtype(width, height):
+    # One entry per move: field before the move packed 1 bit per cell, shape, rotation, row and
+    # column of the falling tetromino, action code, target rotation, column and row of a placement
+    # (zero for other actions), and the score gained by the move
+    return np.dtype([('board', 'u1', ((width * height + 7) // 8,)), ('piece', 'u1'),
+                     ('rotation', 'u1'), ('row', '<i2'), ('column', '<i2'), ('action', 'u1'),
+                     ('target_rotation', 'u1'), ('target_column', '<i2'), ('target_row', '<i2'),
+                     ('reward', '<i4')])
+
+
+# defining the check_meta function
+def check_meta(meta):
+    # Reject datasets written with another record layout
+    if meta.get('version', 1) != FORMAT_VERSION:
+        raise ValueError("dataset format version {} (expected {})".format(
+            meta.get('version', 1), FORMAT_VERSION))
+
+
+# defining the pack_board function
+def pack_board(rows, width):
+    # Pack the row bitmasks into bytes, cell (r, c) at bit r*width + c in little-endian bit order
+    packed = 0
+    for row in reversed(rows):
+        packed = packed << width | row
+    return packed.to_bytes((width * len(rows) + 7) // 8, 'little')
+
+
+# defining the unpack_boards function
+def unpack_boards(boards, width, height):
+    # Expand packed boards into an array of shape (..., height, width) holding 0 or 1 per cell
+    cells = np.unpackbits(boards, axis=-1, count=width * height, bitorder='little')
+    return cells.reshape(boards.shape[:-1] + (height, width))
+
+
+# creating a class name trajectorywriter
+class TrajectoryWriter:
+    # Appends (board, piece, action, reward) records to a dataset directory in fixed-size chunks
+
+    # defining the initializing function
+    def __init__(self, directory, width=Tetris.FIELD_WIDTH, height=Tetris.FIELD_HEIGHT,
+                 chunk_size=65536):
+        # Create the directory, or check that an existing dataset has the same field size
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.width, self.height = width, height
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as file:
+                meta = json.load(file)
+            check_meta(meta)
+            if (meta['width'], meta['height']) != (width, height):
+                raise ValueError("dataset holds {}x{} fields".format(meta['width'], meta['height']))
+        else:
+            with open(meta_path, 'w') as file:
+                json.dump({'version': FORMAT_VERSION, 'width': width, 'height': height}, file)
+        self.dtype = record_dtype(width, height)
+        # Records already on disk, so new games continue the numbering
+        records_path = os.path.join(directory, RECORDS_FILE)
+        size = os.path.getsize(records_path) if os.path.exists(records_path) else 0
+        if size % self.dtype.itemsize:
+            raise ValueError("{} does not hold whole records".format(records_path))
+        self.count = size // self.dtype.itemsize
+        # Fixed-size buffers flushed to the end of the files whenever they fill up
+        self.chunk = np.zeros(chunk_size, dtype=self.dtype)
+        self.buffered = 0
+        self.index = []
+        # First record of the game being written
+        self.start = self.count
+
+    # defining the add function
+    def add(self, rows, piece, rotation, offset, action, reward, placement=None):
+        # Buffer one move, flushing the chunk when it is full
+        record = self.chunk[self.buffered]
+        record['board'] = np.frombuffer(pack_board(rows, self.width), dtype=np.uint8)
+        record['piece'], record['rotation'] = piece, rotation
+        record['row'], record['column'] = offset
+        record['action'], record['reward'] = action, reward
+        if placement is not None:
+            record['target_rotation'], record['target_column'], record['target_row'] = (
+                placement.rotation, placement.column, placement.row)
+        else:
+            record['target_rotation'] = record['target_column'] = record['target_row'] = 0
+        self.buffered += 1
+        self.count += 1
+        if self.buffered == len(self.chunk):
+            self.flush()
+
+    # defining the end_game function
+    def end_game(self, seed, score):
+        # Index the records added since the previous game
+        self.index.append((self.start, self.count - self.start, seed, score))
+        self.start = self.count
+
+    # defining the flush function
+    def flush(self):
+        # Append the buffered records, then the index entries that point at them
+        with open(os.path.join(self.directory, RECORDS_FILE), 'ab') as file:
+            file.write(self.chunk[:self.buffered].tobytes())
+        self.buffered = 0
+        with open(os.path.join(self.directory, INDEX_FILE), 'ab') as file:
+            file.write(np.array(self.index, dtype=INDEX_DTYPE).tobytes())
+        self.index = []
+
+    # defining the close function
+    def close(self):
+        # Write what is still buffered
+        self.flush()
+
+    # defining the enter function
+    def __enter__(self):
+        return self
+
+    # defining the exit function
+    def __exit__(self, *exc):
+        self.close()
+
+    # defining the play function
+    def play(self, game, action, placement=None):
+        # Apply one move to a game and record it with the field and tetromino it was made on
+        rows, piece, rotation, offset, score = (
+            game.rows[:], game.shape, game.rotation, tuple(game.tetromino_offset), game.score)
+        if action == PLACE:
+            game.apply_placement(placement)
+        else:
+            game.play(action)
+        self.add(rows, piece, rotation, offset, action, game.score - score, placement)
+
+
+# defining the open_dataset function
+def open_dataset(directory):
+    # Map the records and the index of a dataset read-only, without loading them into memory
+    with open(os.path.join(directory, META_FILE)) as file:
+        meta = json.load(file)
+    check_meta(meta)
+    dtype = record_dtype(meta['width'], meta['height'])
+    records_path, index_path = (os.path.join(directory, name) for name in (RECORDS_FILE, INDEX_FILE))
+    records = np.memmap(records_path, dtype=dtype, mode='r') \
+        if os.path.exists(records_path) and os.path.getsize(records_path) else np.zeros(0, dtype=dtype)
+    index = np.fromfile(index_path, dtype=INDEX_DTYPE) \
+        if os.path.exists(index_path) else np.zeros(0, dtype=INDEX_DTYPE)
+    return records, index, meta
+
+
+# defining the export_games function
+def export_games(writer, games, policy='greedy', seed=0, max_pieces=None, bag=False):
+    # Play seeded games with a policy and record every placement
+    choose = load_policy(policy)
+    for game_seed in range(seed, seed + games):
+        # Seed the random choices of the policy and the game
+        random.seed(game_seed)
+        game = Tetris(game_seed, bag, writer.width, writer.height)
+        while not game.game_over and (max_pieces is None or game.pieces_placed < max_pieces):
+            placement = choose(game)
+            if placement is None:
+                break
+            writer.play(game, PLACE, placement)
+        writer.end_game(game_seed, game.score)
+
+
+# defining the export_replay function
+def export_replay(writer, data):
+    # Replay a recorded game and record every event
+    seed, bag, (width, height), events = read_replay(data)
+    if (width, height) != (writer.width, writer.height):
+        raise ValueError("replay of a {}x{} field".format(width, height))
+    game = Tetris(seed, bag, width, height)
+    for tick, action, placement in events:
+        writer.play(game, action, placement)
+    writer.end_game(seed, game.score)
+
+
+# defining the main function
+def main(argv=None):
+    # Parse the command-line arguments
+    parser = argparse.ArgumentParser(description="Export game trajectories to a memory-mapped dataset.")
+    parser.add_argument('directory', help="dataset directory (appended to if it exists)")
+    parser.add_argument('--games', type=int, default=0, help="number of simulated games to export")
+    parser.add_argument('--policy', default='greedy',
+                        help="built-in policy ({}) or module:function".format(', '.join(POLICIES)))
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--max-pieces', type=int, default=None, help="stop each game after this many pieces")
+    parser.add_argument('--bag', action='store_true', help="use the 7-bag randomizer")
+    parser.add_argument('--replays', nargs='*', default=[], help="replay files to export")
+    parser.add_argument('--width', type=int, default=Tetris.FIELD_WIDTH, help="field width in cells")
+    parser.add_argument('--height', type=int, default=Tetris.FIELD_HEIGHT, help="field height in cells")
+    args = parser.parse_args(argv)
+    # Export the simulated games and the replays
+    with TrajectoryWriter(args.directory, args.width, args.height) as writer:
+        export_games(writer, args.games, args.policy, args.seed, args.max_pieces, args.bag)
+        for path in args.replays:
+            with open(path, 'rb') as file:
+                export_replay(writer, file.read())
+    print("{} records in {}".format(writer.count, args.directory))
+
+
+# check if the script is being run directly
+if __name__ == "__main__":
+    # run the export
+    main()
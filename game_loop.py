@@ -0,0 +1,135 @@
+# Import the action codes of the headless game engine
+from tetris_engine import DOWN, LEFT, RIGHT
+
+
+# creating a class name gameloop
+class GameLoop:
+    # Fixed-timestep driver applying gravity, lock delay and key repeat to a Tetris game
+
+    # Number of fixed sub-steps per second
+    TICK_RATE = 120
+    # Sub-steps a held key waits before repeating (delayed auto shift)
+    DAS_TICKS = 20
+    # Sub-steps between repeats of a held key (auto repeat rate)
+    ARR_TICKS = 6
+    # Sub-steps a grounded tetromino waits before it locks
+    LOCK_DELAY_TICKS = 60
+    # Number of times moving or rotating a grounded tetromino may restart the lock delay
+    MAX_LOCK_RESETS = 15
+    # Longest stretch of time caught up in one call, so a stalled window does not fast-forward the game
+    MAX_FRAME = 0.25
+    # Actions that repeat while their key is held
+    REPEATING = (LEFT, RIGHT, DOWN)
+
+    # defining the initializing function
+    def __init__(self, tetris, now):
+        # Game driven by the loop
+        self.tetris = tetris
+        # Monotonic time of the last advance and time not yet turned into sub-steps
+        self.last = now
+        self.accumulator = 0.0
+        # Number of sub-steps run so far
+        self.ticks = 0
+        # Sub-steps since the last gravity step and since the tetromino touched the ground
+        self.gravity_ticks = 0
+        self.lock_ticks = 0
+        # Lock delay restarts used by the current tetromino
+        self.lock_resets = 0
+        self.piece = tetris.pieces_placed
+        # Sub-steps each held key has been held for
+        self.held = {}
+        # Set when an action changed the game since the last advance
+        self.changed = False
+
+    # defining the gravity_interval function
+    def gravity_interval(self):
+        # Sub-steps between gravity steps, shrinking with the level
+        return max(1, round(self.TICK_RATE * 0.66**self.tetris.level))
+
+    # defining the grounded function
+    def grounded(self):
+        # Check if the tetromino rests on the floor or on filled cells
+        return not self.tetris.fits(self.tetris.tetromino_offset[0] + 1, self.tetris.tetromino_offset[1])
+
+    # defining the play function
+    def play(self, action):
+        # Remember the tetromino state to detect a successful move
+        before = (self.tetris.tetromino_offset, self.tetris.rotation, self.tetris.pieces_placed)
+        game_over = self.tetris.game_over
+        # Apply the action
+        self.tetris.play(action)
+        # Remember whether the action changed the game
+        if (before != (self.tetris.tetromino_offset, self.tetris.rotation, self.tetris.pieces_placed)
+                or game_over != self.tetris.game_over):
+            self.changed = True
+        # A new tetromino starts with fresh lock delay
+        if self.tetris.pieces_placed != self.piece:
+            self.piece = self.tetris.pieces_placed
+            self.lock_ticks = self.lock_resets = 0
+        # Moving or rotating a grounded tetromino restarts the lock delay a limited number of times
+        elif before != (self.tetris.tetromino_offset, self.tetris.rotation, self.tetris.pieces_placed):
+            if self.lock_ticks and self.lock_resets < self.MAX_LOCK_RESETS:
+                self.lock_ticks = 0
+                self.lock_resets += 1
+
+    # defining the press function
+    def press(self, action):
+        # Ignore presses of keys that are already held
+        if action in self.held:
+            return
+        # Apply the action right away
+        self.play(action)
+        # Start the key repeat for repeating actions
+        if action in self.REPEATING:
+            self.held[action] = 0
+
+    # defining the release function
+    def release(self, action):
+        # Stop the key repeat
+        self.held.pop(action, None)
+
+    # defining the skip function
+    def skip(self, now):
+        # Drop the time elapsed since the last call (used while paused)
+        self.last = now
+        self.accumulator = 0.0
+
+    # defining the advance function
+    def advance(self, now):
+        # Accumulate the elapsed monotonic time
+        self.accumulator += min(now - self.last, self.MAX_FRAME)
+        self.last = now
+        # Run as many fixed sub-steps as the accumulated time allows
+        self.changed = False
+        while self.accumulator >= 1 / self.TICK_RATE:
+            self.accumulator -= 1 / self.TICK_RATE
+            self.step()
+        # Return whether any sub-step changed the game
+        return self.changed
+
+    # defining the step function
+    def step(self):
+        # Count the sub-step
+        self.ticks += 1
+        # Check if game over
+        if self.tetris.game_over:
+            return
+        # Repeat held keys after the DAS delay, then every ARR sub-steps
+        for action in list(self.held):
+            self.held[action] += 1
+            held = self.held[action] - self.DAS_TICKS
+            if held >= 0 and held % self.ARR_TICKS == 0:
+                self.play(action)
+        # Apply gravity
+        self.gravity_ticks += 1
+        if self.gravity_ticks >= self.gravity_interval():
+            self.gravity_ticks = 0
+            if not self.grounded():
+                self.play(DOWN)
+        # Lock a grounded tetromino once the lock delay runs out
+        if self.grounded():
+            self.lock_ticks += 1
+            if self.lock_ticks >= self.LOCK_DELAY_TICKS:
+                self.play(DOWN)
+        else:
+            self.lock_ticks = 0
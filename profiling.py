@@ -0,0 +1,105 @@
+# Import defaultdict for the per-operation counters
+from collections import defaultdict
+# Import functools for keeping the wrapped method names
+import functools
+# Import time module for nanosecond timers
+import time
+
+# Engine methods timed by Profiler.attach
+ENGINE_OPS = ('move', 'rotate', 'hard_drop', 'apply_tetromino', 'get_color', 'fits', 'placements')
+
+
+# defining the percentile function
+def percentile(samples, fraction):
+    # Nearest-rank percentile of sorted samples
+    if not samples:
+        return 0
+    return samples[min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))]
+
+
+# creating a class name profiler
+class Profiler:
+    # Counters and nanosecond timers that a game and its renderer report into
+
+    # defining the initializing function
+    def __init__(self, keep_samples=False, max_samples=1000000):
+        # Number of calls and total nanoseconds per operation
+        self.calls = defaultdict(int)
+        self.nanoseconds = defaultdict(int)
+        # Individual timings per operation, kept for percentiles if requested
+        self.keep_samples = keep_samples
+        self.max_samples = max_samples
+        self.samples = defaultdict(list)
+        # Number of locks that eliminated lines and number of lines eliminated
+        self.line_clears = 0
+        self.lines_eliminated = 0
+
+    # defining the record function
+    def record(self, name, nanoseconds):
+        # Count one operation and its duration
+        self.calls[name] += 1
+        self.nanoseconds[name] += nanoseconds
+        samples = self.samples[name]
+        if self.keep_samples and len(samples) < self.max_samples:
+            samples.append(nanoseconds)
+
+    # defining the wrap function
+    def wrap(self, name, function):
+        # Return a version of function that reports every call
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter_ns() - start)
+        return timed
+
+    # defining the attach function
+    def attach(self, game):
+        # Time the engine methods of one game (the class itself stays uninstrumented)
+        for name in ENGINE_OPS:
+            setattr(game, name, self.wrap(name, getattr(game, name)))
+        # Count line clears whenever a tetromino locks
+        apply_tetromino = game.apply_tetromino
+
+        def apply_and_count():
+            lines = game.total_lines_eliminated
+            apply_tetromino()
+            if game.total_lines_eliminated > lines:
+                self.line_clears += 1
+                self.lines_eliminated += game.total_lines_eliminated - lines
+        game.apply_tetromino = apply_and_count
+        return game
+
+    # defining the attach_renderer function
+    def attach_renderer(self, app):
+        # Time every frame drawn by the application
+        app.update = self.wrap('frame', app.update)
+        return app
+
+    # defining the report function
+    def report(self):
+        # Summarize the counters, with latency percentiles where samples were kept
+        operations = {}
+        for name, calls in sorted(self.calls.items()):
+            total = self.nanoseconds[name]
+            stats = {
+                'calls': calls,
+                'total_ns': total,
+                'mean_ns': total / calls,
+                'ops_per_second': calls * 1e9 / total if total else 0,
+            }
+            samples = sorted(self.samples[name])
+            if samples:
+                stats.update({'p50_ns': percentile(samples, 0.5),
+                              'p90_ns': percentile(samples, 0.9),
+                              'p99_ns': percentile(samples, 0.99),
+                              'max_ns': samples[-1]})
+            operations[name] = stats
+        return {
+            'operations': operations,
+            'collision_checks': self.calls['fits'],
+            'line_clears': self.line_clears,
+            'lines_eliminated': self.lines_eliminated,
+        }
@@ -0,0 +1,159 @@
+# Import random module for picking seeds
+import random
+# Import struct for the binary header
+import struct
+# Import the headless game engine
+from tetris_engine import Placement, Tetris
+
+# Action code of a bot placement; the event carries its rotation, column and row
+PLACE = 6
+# Offset added to placement columns and rows so they are stored as unsigned varints
+PLACE_OFFSET = 8
+# Magic bytes and version at the start of every replay
+MAGIC = b'TTRP'
+VERSION = 2
+# Header layout: magic, version, flags, seed, field width, field height, number of events
+HEADER = struct.Struct('<4sBBQHHI')
+# Header flag set when the game used the 7-bag randomizer
+FLAG_BAG = 1
+
+
+# defining the write_varint function
+def write_varint(data, value):
+    # Append an unsigned integer using 7 bits per byte
+    while value >= 0x80:
+        data.append(value & 0x7f | 0x80)
+        value >>= 7
+    data.append(value)
+
+
+# defining the read_varint function
+def read_varint(data, pos):
+    # Read an unsigned integer written by write_varint and return it with the next position
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+# creating a class name replayrecorder
+class ReplayRecorder:
+    # Plays a seeded game and records every (tick, action) event in a compact binary form
+
+    # defining the initializing function
+    def __init__(self, seed=None, bag=False, width=Tetris.FIELD_WIDTH, height=Tetris.FIELD_HEIGHT):
+        # Pick a seed unless one is given
+        self.seed = random.getrandbits(64) if seed is None else seed
+        # Create the recorded game
+        self.bag = bag
+        self.game = Tetris(self.seed, bag, width, height)
+        # Encoded events, their number and the tick of the last event
+        self.events = bytearray()
+        self.count = 0
+        self.last_tick = 0
+
+    # defining the play function
+    def play(self, tick, action, placement=None):
+        # Apply the action to the game
+        if action == PLACE:
+            self.game.apply_placement(placement)
+        else:
+            self.game.play(action)
+        # Record the tick as the (non-negative) delta from the previous event, then the action
+        write_varint(self.events, tick - self.last_tick)
+        self.events.append(action)
+        # Placements also record the rotation and the offset column and row
+        if action == PLACE:
+            self.events.append(placement.rotation)
+            write_varint(self.events, placement.column + PLACE_OFFSET)
+            write_varint(self.events, placement.row + PLACE_OFFSET)
+        self.last_tick = tick
+        self.count += 1
+
+    # defining the to_bytes function
+    def to_bytes(self):
+        # Return the header followed by the encoded events
+        flags = FLAG_BAG if self.bag else 0
+        return HEADER.pack(MAGIC, VERSION, flags, self.seed, self.game.width, self.game.height,
+                           self.count) + bytes(self.events)
+
+    # defining the save function
+    def save(self, path):
+        # Write the replay to a file
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+
+# defining the read_replay function
+def read_replay(data):
+    # Check the magic bytes and the version
+    if len(data) < 5 or data[:4] != MAGIC:
+        raise ValueError("not a Tetris replay")
+    if data[4] != VERSION:
+        raise ValueError("unsupported replay version {} (expected {})".format(data[4], VERSION))
+    # Decode the header
+    if len(data) < HEADER.size:
+        raise ValueError("truncated replay header")
+    magic, version, flags, seed, width, height, count = HEADER.unpack_from(data)
+    if width < 4 or height < 4:
+        raise ValueError("invalid field size {}x{}".format(width, height))
+    pos = HEADER.size
+    # Decode the events into (tick, action, placement) tuples
+    events = []
+    tick = 0
+    try:
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            tick += delta
+            action = data[pos]
+            pos += 1
+            if action > PLACE:
+                raise ValueError("unknown action {} at tick {}".format(action, tick))
+            placement = None
+            if action == PLACE:
+                rotation = data[pos]
+                column, pos = read_varint(data, pos + 1)
+                row, pos = read_varint(data, pos)
+                placement = Placement(rotation, column - PLACE_OFFSET, row - PLACE_OFFSET, None, None)
+            events.append((tick, action, placement))
+    except IndexError:
+        raise ValueError("truncated replay after {} of {} events".format(len(events), count)) from None
+    return seed, bool(flags & FLAG_BAG), (width, height), events
+
+
+# defining the footprint function
+def footprint(shape, placement):
+    # Field rows and row bitmasks covered by a placement of a tetromino shape
+    masks, left, width = Tetris.GEOMETRY[shape][placement.rotation]
+    return tuple((r + placement.row, mask << (placement.column + left)) for (r, mask) in masks)
+
+
+# defining the replay function
+def replay(data, until=None):
+    # Rebuild the game from the seed and the recorded events, optionally stopping before tick `until`
+    seed, bag, (width, height), events = read_replay(data)
+    game = Tetris(seed, bag, width, height)
+    for tick, action, placement in events:
+        if until is not None and tick >= until:
+            break
+        if action == PLACE:
+            # Only accept placements the tetromino can reach from where it is
+            reachable = {footprint(game.shape, p) for p in game.placements()}
+            if placement.rotation not in range(4) or footprint(game.shape, placement) not in reachable:
+                raise ValueError("unreachable placement {} at tick {}".format(
+                    (placement.rotation, placement.column, placement.row), tick))
+            game.apply_placement(placement)
+        else:
+            game.play(action)
+    return game
+
+
+# defining the load_replay function
+def load_replay(path, until=None):
+    # Rebuild the game stored in a replay file
+    with open(path, 'rb') as file:
+        return replay(file.read(), until)
@@ -0,0 +1,96 @@
+# Import CSV module for importing old CSV score files
+import csv
+# Import os for checking score files
+import os
+# Import sqlite3 for the indexed leaderboard
+import sqlite3
+# Import lock for thread safety
+from threading import Lock
+
+
+# creating a class name sqlitescorestore
+class SqliteScoreStore:
+    # SQLite leaderboard indexed by score and by player
+
+    # defining the initializing function
+    def __init__(self, path='scores.db'):
+        # Open the database (shared between the GUI and worker threads)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        # Create lock for thread safety
+        self.lock = Lock()
+        # Create the tables and indexes
+        with self.lock, self.connection:
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS scores (
+                    id INTEGER PRIMARY KEY,
+                    player TEXT NOT NULL,
+                    score INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC);
+                CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player, score DESC);
+                CREATE TABLE IF NOT EXISTS imported_files (
+                    path TEXT PRIMARY KEY
+                );
+            ''')
+
+    # defining the add function
+    def add(self, player, score):
+        # Save one score
+        self.add_many([(player, score)])
+
+    # defining the add_many function
+    def add_many(self, rows):
+        # Insert all rows in one transaction
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'INSERT INTO scores (player, score) VALUES (?, ?)', rows)
+
+    # defining the top function
+    def top(self, k=10):
+        # Walk the score index from the top
+        with self.lock:
+            return self.connection.execute(
+                'SELECT player, score FROM scores ORDER BY score DESC LIMIT ?', (k,)).fetchall()
+
+    # defining the best function
+    def best(self, player):
+        # Read the first entry of the player in the player index
+        with self.lock:
+            return self.connection.execute(
+                'SELECT MAX(score) FROM scores WHERE player = ?', (player,)).fetchone()[0]
+
+    # defining the import_csv function
+    def import_csv(self, path='scores.csv', batch_size=10000):
+        # Import a CSV score file once; return the number of rows imported
+        path = os.path.abspath(path)
+        if not os.path.exists(path):
+            return 0
+        with self.lock, self.connection:
+            # Skip files imported before
+            if self.connection.execute('SELECT 1 FROM imported_files WHERE path = ?', (path,)).fetchone():
+                return 0
+            # Stream the rows into the database in batches
+            count = 0
+            with open(path, newline='') as file:
+                batch = []
+                for row in csv.reader(file):
+                    if len(row) < 2 or not row[1].lstrip('-').isdigit():
+                        continue
+                    batch.append((row[0], int(row[1])))
+                    if len(batch) >= batch_size:
+                        self.connection.executemany(
+                            'INSERT INTO scores (player, score) VALUES (?, ?)', batch)
+                        count += len(batch)
+                        batch = []
+                self.connection.executemany(
+                    'INSERT INTO scores (player, score) VALUES (?, ?)', batch)
+                count += len(batch)
+            # Remember the file in the same transaction
+            self.connection.execute('INSERT INTO imported_files (path) VALUES (?)', (path,))
+        return count
+
+    # defining the close function
+    def close(self):
+        # Close the database
+        with self.lock:
+            self.connection.close()
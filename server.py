@@ -0,0 +1,267 @@
+# Import argparse for the command-line interface
+import argparse
+# Import asyncio for serving many games and clients in one process
+import asyncio
+# Import struct for the binary frames
+import struct
+# Import time module for the monotonic game clock
+import time
+# Import the headless game engine and its action codes
+from tetris_engine import DROP, NOOP, Tetris
+# Import the fixed-timestep game loop
+from game_loop import GameLoop
+
+# Roles a client can join a game with; only players send inputs
+PLAYER, SPECTATOR = 0, 1
+# Join request sent by a client right after connecting: game id, role
+JOIN = struct.Struct('<HB')
+# Flag set on an input byte when the key is released instead of pressed
+RELEASE = 0x80
+# Every frame sent by the server is prefixed with its length
+LENGTH = struct.Struct('<I')
+# Frame types
+WELCOME, STATE = 1, 2
+# Welcome frame: type, game id, field width, field height
+WELCOME_FRAME = struct.Struct('<BHHH')
+# State frame header: type, game id, tick, score, level, lines eliminated, tetromino shape,
+# rotation, color, row, column, game over and number of changed rows
+STATE_FRAME = struct.Struct('<BHIIHIBBBhhBH')
+# Each changed row follows the header as its index and the colors of its cells
+ROW_INDEX = struct.Struct('<H')
+
+
+# defining the encode_state function
+def encode_state(game_id, tick, state, colors, width, rows):
+    # Pack the header, then the index and colors of every listed row
+    frame = bytearray(STATE_FRAME.pack(STATE, game_id, tick, *state, len(rows)))
+    for r in rows:
+        frame += ROW_INDEX.pack(r)
+        frame += colors[r*width:(r+1)*width]
+    return LENGTH.pack(len(frame)) + frame
+
+
+# creating a class name hostedgame
+class HostedGame:
+    # One game hosted by the server, with its clients and the last state broadcast to them
+
+    # defining the initializing function
+    def __init__(self, game_id, seed, width, height, now):
+        # Create the game and its fixed-timestep loop
+        self.id = game_id
+        self.tetris = Tetris(seed, width=width, height=height)
+        self.loop = GameLoop(self.tetris, now)
+        # Connected clients
+        self.clients = set()
+        # Field colors and tetromino state as last broadcast
+        self.sent_tick = 0
+        self.sent_colors = bytes(self.tetris.colors)
+        self.sent_state = self.state()
+
+    # defining the state function
+    def state(self):
+        # Scores and tetromino of the game as packed in a state frame
+        tetris = self.tetris
+        return (tetris.score, tetris.level, tetris.total_lines_eliminated, tetris.shape,
+                tetris.rotation, tetris.tetromino_color, tetris.tetromino_offset[0],
+                tetris.tetromino_offset[1], tetris.game_over)
+
+    # defining the keyframe function
+    def keyframe(self):
+        # Every row of the last broadcast state, for clients that join or fell behind
+        return encode_state(self.id, self.sent_tick, self.sent_state, self.sent_colors,
+                            self.tetris.width, range(self.tetris.height))
+
+    # defining the delta function
+    def delta(self):
+        # Rows whose colors changed since the last broadcast, plus the tetromino state
+        width = self.tetris.width
+        colors = self.tetris.colors
+        changed = [r for r in range(self.tetris.height)
+                   if colors[r*width:(r+1)*width] != self.sent_colors[r*width:(r+1)*width]]
+        state = self.state()
+        # Nothing to send if neither the field nor the tetromino moved
+        if not changed and state == self.sent_state:
+            return None
+        self.sent_tick = self.loop.ticks
+        self.sent_colors = bytes(colors)
+        self.sent_state = state
+        return encode_state(self.id, self.sent_tick, state, self.sent_colors, width, changed)
+
+
+# creating a class name client
+class Client:
+    # Connection of one player or spectator
+
+    # defining the initializing function
+    def __init__(self, writer, role):
+        # Stream the frames are written to and role of the client
+        self.writer = writer
+        self.role = role
+        # Set when deltas were skipped and the client needs a keyframe
+        self.stale = False
+
+
+# creating a class name tetrisserver
+class TetrisServer:
+    # Hosts many games in one process and streams delta-encoded states to their clients
+
+    # Broadcasts per second
+    TICK_RATE = 60
+    # Bytes a client may have waiting in its send buffer before deltas are skipped for it
+    MAX_BUFFERED = 64 * 1024
+
+    # defining the initializing function
+    def __init__(self, seed=0, width=Tetris.FIELD_WIDTH, height=Tetris.FIELD_HEIGHT):
+        # Every game starts from the same seed so the players of a match get the same tetrominos
+        self.seed = seed
+        self.width, self.height = width, height
+        # Hosted games by id
+        self.games = {}
+
+    # defining the join function
+    def join(self, game_id):
+        # Return the game with the given id, creating it on the first join
+        if game_id not in self.games:
+            self.games[game_id] = HostedGame(game_id, self.seed, self.width, self.height,
+                                             time.monotonic())
+        return self.games[game_id]
+
+    # defining the send function
+    def send(self, client, game, frame):
+        # Skip deltas while the client cannot keep up, then resynchronize it with a keyframe
+        if client.writer.transport.get_write_buffer_size() > self.MAX_BUFFERED:
+            client.stale = True
+        elif client.stale:
+            client.writer.write(game.keyframe())
+            client.stale = False
+        else:
+            client.writer.write(frame)
+
+    # defining the handle function
+    async def handle(self, reader, writer):
+        # Read the join request
+        try:
+            game_id, role = JOIN.unpack(await reader.readexactly(JOIN.size))
+        except asyncio.IncompleteReadError:
+            writer.close()
+            return
+        game = self.join(game_id)
+        client = Client(writer, role)
+        # Send the field size and the current state
+        frame = WELCOME_FRAME.pack(WELCOME, game_id, self.width, self.height)
+        writer.write(LENGTH.pack(len(frame)) + frame + game.keyframe())
+        game.clients.add(client)
+        try:
+            # Apply the inputs of players, one byte per key press or release
+            while True:
+                data = await reader.read(256)
+                if not data:
+                    break
+                if role != PLAYER:
+                    continue
+                for byte in data:
+                    action = byte & ~RELEASE
+                    if not NOOP < action <= DROP:
+                        continue
+                    if byte & RELEASE:
+                        game.loop.release(action)
+                    else:
+                        game.loop.press(action)
+        except ConnectionError:
+            pass
+        finally:
+            # Forget the client, and the game once nobody is connected to it
+            game.clients.discard(client)
+            if not game.clients:
+                self.games.pop(game_id, None)
+            writer.close()
+
+    # defining the tick function
+    async def tick(self):
+        # Advance every game and broadcast its delta at a fixed rate
+        interval = 1 / self.TICK_RATE
+        deadline = time.monotonic()
+        while True:
+            now = time.monotonic()
+            for game in list(self.games.values()):
+                game.loop.advance(now)
+                frame = game.delta()
+                if frame is None:
+                    continue
+                for client in list(game.clients):
+                    self.send(client, game, frame)
+            # Sleep until the next broadcast without drifting
+            deadline = max(deadline + interval, now)
+            await asyncio.sleep(deadline - time.monotonic())
+
+    # defining the serve function
+    async def serve(self, host='127.0.0.1', port=7000):
+        # Accept connections and run the games until cancelled
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.tick())
+
+
+# creating a class name remoteboard
+class RemoteBoard:
+    # Client-side copy of a hosted game rebuilt from the frames of the server
+
+    # defining the initializing function
+    def __init__(self, width, height):
+        # Field colors and latest state header
+        self.width, self.height = width, height
+        self.colors = bytearray(width * height)
+        self.tick = 0
+        self.state = None
+
+    # defining the apply function
+    def apply(self, frame):
+        # Copy the changed rows and the tetromino state of a state frame
+        header = STATE_FRAME.unpack_from(frame)
+        self.tick = header[2]
+        self.state = header[3:-1]
+        pos = STATE_FRAME.size
+        for _ in range(header[-1]):
+            r, = ROW_INDEX.unpack_from(frame, pos)
+            pos += ROW_INDEX.size
+            self.colors[r*self.width:(r+1)*self.width] = frame[pos:pos + self.width]
+            pos += self.width
+
+
+# defining the read_frame function
+async def read_frame(reader):
+    # Read one length-prefixed frame sent by the server
+    size, = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(size)
+
+
+# defining the connect function
+async def connect(host, port, game_id, role=SPECTATOR):
+    # Join a hosted game and return the streams and the board the state frames apply to
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(JOIN.pack(game_id, role))
+    kind, game_id, width, height = WELCOME_FRAME.unpack(await read_frame(reader))
+    return reader, writer, RemoteBoard(width, height)
+
+
+# defining the main function
+def main(argv=None):
+    # Parse the command-line arguments
+    parser = argparse.ArgumentParser(description="Host Tetris games over TCP.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on")
+    parser.add_argument('--port', type=int, default=7000, help="port to listen on")
+    parser.add_argument('--seed', type=int, default=0, help="seed shared by every game")
+    parser.add_argument('--width', type=int, default=Tetris.FIELD_WIDTH, help="field width in cells")
+    parser.add_argument('--height', type=int, default=Tetris.FIELD_HEIGHT, help="field height in cells")
+    args = parser.parse_args(argv)
+    # Run the server until interrupted
+    try:
+        asyncio.run(TetrisServer(args.seed, args.width, args.height).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+# check if the script is being run directly
+if __name__ == "__main__":
+    # run the server
+    main()
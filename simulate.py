@@ -0,0 +1,166 @@
+# Import argparse for the command-line interface
+import argparse
+# Import importlib for loading policies given as module:function
+import importlib
+# Import json for the machine-readable report
+import json
+# Import os for counting cores
+import os
+# Import random module for the random policy and per-game seeds
+import random
+# Import time module for measuring throughput
+import time
+# Import the process pool used to spread games across cores
+from concurrent.futures import ProcessPoolExecutor
+# Import the headless game engine
+from tetris_engine import Tetris
+# Import the leaderboard store
+from scores import SqliteScoreStore
+
+# Statistics collected from every game
+METRICS = ('score', 'level', 'total_lines_eliminated', 'pieces_placed')
+
+
+# defining the weigh function
+def weigh(features):
+    # Combine aggregate height, holes and bumpiness into one score (higher is better)
+    aggregate_height, holes, bumpiness = features
+    return -0.51 * aggregate_height - 0.36 * holes - 0.18 * bumpiness
+
+
+# defining the greedy_policy function
+def greedy_policy(game):
+    # Pick the placement with the best board evaluation and line clears, using the engine's column features
+    placements = game.placements()
+    return max(placements, key=lambda p: weigh(game.placement_features(p)) + 0.76 * p.lines_eliminated,
+               default=None)
+
+
+# defining the random_policy function
+def random_policy(game):
+    # Pick any reachable placement
+    placements = game.placements()
+    return random.choice(placements) if placements else None
+
+
+# Policies selectable by name
+POLICIES = {
+    'greedy': greedy_policy,
+    'random': random_policy,
+}
+
+
+# defining the load_policy function
+def load_policy(name):
+    # Look up a built-in policy or import one given as module:function
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, function = name.partition(':')
+    return getattr(importlib.import_module(module), function)
+
+
+# defining the play_game function
+def play_game(seed, policy='greedy', max_pieces=None, bag=False):
+    # Seed the random choices of the policy
+    random.seed(seed)
+    # Create the game with its own seeded piece generator and load the policy
+    game = Tetris(seed, bag)
+    choose = load_policy(policy)
+    # Let the policy place tetrominos until the game ends
+    while not game.game_over and (max_pieces is None or game.pieces_placed < max_pieces):
+        placement = choose(game)
+        if placement is None:
+            break
+        game.apply_placement(placement)
+    # Return the game statistics
+    return dict({'seed': seed}, **{metric: getattr(game, metric) for metric in METRICS})
+
+
+# defining the play_games function
+def play_games(args):
+    # Play a chunk of games in one worker process
+    seeds, policy, max_pieces, bag = args
+    return [play_game(seed, policy, max_pieces, bag) for seed in seeds]
+
+
+# defining the summarize function
+def summarize(results):
+    # Aggregate the statistics of all games
+    report = {'games': len(results)}
+    for metric in METRICS:
+        values = [result[metric] for result in results]
+        report[metric] = {
+            'mean': sum(values) / len(values) if values else 0,
+            'min': min(values, default=0),
+            'max': max(values, default=0),
+            'total': sum(values),
+        }
+    return report
+
+
+# defining the run function
+def run(games, policy='greedy', seed=0, workers=None, max_pieces=None, bag=False, chunk_size=None,
+        store=None):
+    # Split the game seeds into about four chunks per worker, so every core gets work and
+    # each task still carries enough games
+    workers = workers or os.cpu_count()
+    chunk_size = chunk_size or max(1, games // (workers * 4))
+    seeds = list(range(seed, seed + games))
+    chunks = [(seeds[i:i + chunk_size], policy, max_pieces, bag)
+              for i in range(0, len(seeds), chunk_size)]
+    # Play the chunks on all cores
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in executor.map(play_games, chunks):
+            results.extend(chunk)
+            # Save each chunk of scores in one batch
+            if store is not None:
+                store.add_many([('{}#{}'.format(policy, result['seed']), result['score'])
+                                for result in chunk])
+    elapsed = time.perf_counter() - start
+    # Build the aggregate report
+    report = summarize(results)
+    report['policy'] = policy
+    report['seconds'] = elapsed
+    report['games_per_second'] = len(results) / elapsed if elapsed else 0
+    return report
+
+
+# defining the main function
+def main(argv=None):
+    # Parse the command-line arguments
+    parser = argparse.ArgumentParser(description="Run headless Tetris games on all cores.")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play")
+    parser.add_argument('--policy', default='greedy',
+                        help="built-in policy ({}) or module:function".format(', '.join(POLICIES)))
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of processes")
+    parser.add_argument('--max-pieces', type=int, default=None, help="stop each game after this many pieces")
+    parser.add_argument('--bag', action='store_true', help="use the 7-bag randomizer")
+    parser.add_argument('--scores', default=None, help="SQLite leaderboard to save the scores to")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+    # Open the leaderboard if requested
+    store = SqliteScoreStore(args.scores) if args.scores else None
+    # Run the games
+    report = run(args.games, args.policy, args.seed, args.workers, args.max_pieces, args.bag,
+                 store=store)
+    if store is not None:
+        store.close()
+    # Print the report
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print("{} games with the {} policy in {:.1f}s ({:.1f} games/sec)".format(
+        report['games'], args.policy, report['seconds'], report['games_per_second']))
+    for metric in METRICS:
+        stats = report[metric]
+        print("{:<24} mean {:>10.1f}  min {:>8}  max {:>8}".format(
+            metric, stats['mean'], stats['min'], stats['max']))
+
+
+# check if the script is being run directly
+if __name__ == "__main__":
+    # run the simulation
+    main()
@@ -0,0 +1,155 @@
+# Import copy for trying placements on copies of a game
+import copy
+# Import random module for choosing placements
+import random
+# Import unittest for the test cases
+import unittest
+# Import the headless game engine
+from tetris_engine import DOWN, LEFT, Tetris
+
+# Indexes of the T and I tetrominos in Tetris.TETROMINOS
+T, I = 4, 6
+
+
+# defining the fill function
+def fill(game, cells):
+    # Mark cells of the field as occupied
+    for (r, c) in cells:
+        game.rows[r] |= 1 << c
+        game.columns[c] |= 1 << r
+
+
+# defining the scan_features function
+def scan_features(game):
+    # Column heights, aggregate height, holes and bumpiness from a full scan of the field
+    field = game.field
+    heights, holes = [], 0
+    for c in range(game.width):
+        column = [row[c] for row in field]
+        filled = [r for r in range(game.height) if column[r]]
+        heights.append(game.height - filled[0] if filled else 0)
+        holes += sum(1 for r in range(filled[0], game.height) if not column[r]) if filled else 0
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return heights, (sum(heights), holes, bumpiness)
+
+
+# creating a class name featuretests
+class FeatureTests(unittest.TestCase):
+    # Column features kept by the engine match a full scan of the field
+
+    # defining the test_features_match_scan function
+    def test_features_match_scan(self):
+        # Play seeded games with random placements on fields of several widths
+        for seed, width in ((0, 10), (1, 6), (2, 4)):
+            game = Tetris(seed, width=width)
+            rng = random.Random(seed)
+            while not game.game_over and game.pieces_placed < 150:
+                placements = game.placements()
+                if not placements:
+                    break
+                # Placements that clear lines are chosen often, to exercise the line clears
+                placement = max(placements, key=lambda p: p.lines_eliminated) \
+                    if rng.random() < 0.5 else rng.choice(placements)
+                # The features predicted for each placement match the features after applying it
+                for candidate in placements[:8] + [placement]:
+                    after = copy.deepcopy(game)
+                    after.apply_placement(candidate)
+                    self.assertEqual(game.placement_features(candidate), after.features())
+                game.apply_placement(placement)
+                heights, features = scan_features(game)
+                self.assertEqual(list(game.column_heights), heights)
+                self.assertEqual(game.features(), features)
+
+
+# creating a class name kicktests
+class KickTests(unittest.TestCase):
+    # Wall kicks follow SRS for the spawn state of every tetromino
+
+    # defining the test_kick_tables function
+    def test_kick_tables(self):
+        # State 0 is the SRS L state, so its clockwise tests are SRS L -> 0 as (row, column)
+        self.assertEqual(Tetris.KICKS[T][0], ((0, 0), (0, -1), (1, -1), (-2, 0), (-2, -1)))
+        self.assertEqual(Tetris.KICKS[I][0], ((0, 0), (0, 1), (0, -2), (2, 1), (-1, -2)))
+        # State 1 is the SRS spawn state, so its tests are SRS 0 -> R
+        self.assertEqual(Tetris.KICKS[T][1], ((0, 0), (0, -1), (-1, -1), (2, 0), (2, -1)))
+
+    # defining the test_t_kicks_down function
+    def test_t_kicks_down(self):
+        # A T pointing left whose upright rotation is blocked on both sides kicks one row down and left
+        game = Tetris(0)
+        game.set_tetromino(T, 0)
+        game.tetromino_offset = [16, 4]
+        fill(game, [(17, 3), (17, 6)])
+        game.rotate()
+        self.assertEqual(game.rotation, 1)
+        self.assertEqual(game.tetromino_offset, [17, 3])
+
+    # defining the test_i_kicks_off_wall function
+    def test_i_kicks_off_wall(self):
+        # A vertical I against the right wall kicks two columns left when it turns flat
+        game = Tetris(0)
+        game.set_tetromino(I, 0)
+        game.tetromino_offset = [10, game.width - 2]
+        game.rotate()
+        self.assertEqual(game.rotation, 1)
+        self.assertEqual(game.tetromino_offset, [10, game.width - 4])
+
+
+# creating a class name snapshottests
+class SnapshotTests(unittest.TestCase):
+    # Snapshots restore a game exactly and share the board while a tetromino falls
+
+    # defining the play function
+    def play(self, game, actions):
+        # Play a list of action codes and return the states seen along the way
+        states = []
+        for action in actions:
+            game.play(action)
+            states.append(tuple(game.snapshot()))
+        return states
+
+    # defining the test_round_trip function
+    def test_round_trip(self):
+        # Restoring a snapshot brings back the same state and the same future
+        for bag in (False, True):
+            game = Tetris(3, bag)
+            rng = random.Random(3)
+            self.play(game, [rng.randrange(6) for _ in range(400)])
+            snapshot = game.snapshot()
+            actions = [rng.randrange(6) for _ in range(400)]
+            first = self.play(game, actions)
+            game.restore(snapshot)
+            self.assertEqual(game.snapshot(), snapshot)
+            self.assertEqual(tuple(game.snapshot()), tuple(snapshot))
+            self.assertEqual(self.play(game, actions), first)
+
+    # defining the test_sharing function
+    def test_sharing(self):
+        # Snapshots taken while the same tetromino falls share one board
+        game = Tetris(5)
+        first = game.snapshot()
+        game.play(LEFT)
+        game.play(DOWN)
+        second = game.snapshot()
+        self.assertIs(first.board, second.board)
+        self.assertNotEqual(first, second)
+        # A restored game keeps sharing the board of its snapshot
+        game.restore(first)
+        self.assertIs(game.snapshot().board, first.board)
+        # Locking the tetromino freezes a new board
+        game.hard_drop()
+        self.assertIsNot(game.snapshot().board, first.board)
+
+    # defining the test_hash_ignores_generator function
+    def test_hash_ignores_generator(self):
+        # Positions that only differ in the upcoming tetrominos compare and hash equal
+        first, second = Tetris(1).snapshot(), Tetris(2).snapshot()
+        first = first._replace(shape=second.shape, offset=second.offset)
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+
+
+# check if the script is being run directly
+if __name__ == "__main__":
+    # run the tests
+    unittest.main()
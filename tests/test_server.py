@@ -0,0 +1,81 @@
+# Import asyncio for running the server and its clients in one event loop
+import asyncio
+# Import unittest for the test cases
+import unittest
+# Import the game server and its client helpers
+import server
+# Import the action codes
+from tetris_engine import DROP, LEFT, RIGHT, ROTATE
+
+
+# creating a class name loopbacktests
+class LoopbackTests(unittest.IsolatedAsyncioTestCase):
+    # Clients connected over the loopback interface rebuild the hosted game from the frames
+
+    # defining the start function
+    async def start(self, game_server):
+        # Listen on a free loopback port and run the game ticks
+        listener = await asyncio.start_server(game_server.handle, '127.0.0.1', 0)
+        self.addAsyncCleanup(self.stop, listener)
+        self.ticks = asyncio.create_task(game_server.tick())
+        return listener.sockets[0].getsockname()[1]
+
+    # defining the stop function
+    async def stop(self, listener):
+        # Stop the ticks and the listener
+        self.ticks.cancel()
+        listener.close()
+
+    # defining the drain function
+    async def drain(self, reader, board):
+        # Apply frames until none arrives for a while
+        while True:
+            try:
+                frame = await asyncio.wait_for(server.read_frame(reader), 0.2)
+            except asyncio.TimeoutError:
+                return
+            board.apply(frame)
+
+    # defining the test_player_and_spectator function
+    async def test_player_and_spectator(self):
+        # A player and a spectator join the same game
+        game_server = server.TetrisServer(seed=5)
+        port = await self.start(game_server)
+        player_reader, player_writer, player_board = await server.connect(
+            '127.0.0.1', port, 3, server.PLAYER)
+        spectator_reader, spectator_writer, spectator_board = await server.connect(
+            '127.0.0.1', port, 3)
+        # The player presses and releases keys until some tetrominos have locked
+        for action in [LEFT, ROTATE, RIGHT, RIGHT, DROP] * 6:
+            player_writer.write(bytes([action, action | server.RELEASE]))
+            await player_writer.drain()
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.1)
+        # Stop the game, then check that both clients hold the state last broadcast
+        self.ticks.cancel()
+        for reader, board in ((player_reader, player_board), (spectator_reader, spectator_board)):
+            await self.drain(reader, board)
+        game = game_server.games[3]
+        self.assertGreater(game.tetris.pieces_placed, 0)
+        for board in (player_board, spectator_board):
+            self.assertEqual(bytes(board.colors), game.sent_colors)
+            self.assertEqual(board.state, game.sent_state)
+        player_writer.close()
+        spectator_writer.close()
+
+    # defining the test_large_field function
+    async def test_large_field(self):
+        # The keyframe of a field larger than 64 KiB reaches a joining client
+        game_server = server.TetrisServer(width=40, height=1600)
+        port = await self.start(game_server)
+        reader, writer, board = await server.connect('127.0.0.1', port, 1)
+        board.apply(await server.read_frame(reader))
+        self.assertEqual((board.width, board.height), (40, 1600))
+        self.assertEqual(bytes(board.colors), game_server.games[1].sent_colors)
+        writer.close()
+
+
+# check if the script is being run directly
+if __name__ == "__main__":
+    # run the tests
+    unittest.main()
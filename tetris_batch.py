@@ -0,0 +1,173 @@
+# Import NumPy for vectorized game state
+import numpy as np
+# Import the scalar engine for the game rules and tetromino shapes
+from tetris_engine import COLORS, DOWN, DROP, LEFT, RIGHT, ROTATE, Tetris
+
+# Number of distinct actions accepted by TetrisBatch.step
+NUM_ACTIONS = 6
+
+
+# creating a class name tetrisbatch
+class TetrisBatch:
+    # Steps N independent games at once over arrays of shape (N, height, width)
+
+    # Tetromino cells indexed by (shape, rotation, cell, row/column)
+    CELLS = np.array(Tetris.ROTATIONS, dtype=np.int64)
+    # Wall-kick offsets indexed by (shape, rotation, test, row/column), padded with (0, 0)
+    KICKS = np.array([[tests + ((0, 0),) * (5 - len(tests)) for tests in kicks]
+                      for kicks in Tetris.KICKS], dtype=np.int64)
+    # Scores for eliminating lines
+    SCORE_PER_ELIMINATED_LINES = np.array(Tetris.SCORE_PER_ELIMINATED_LINES, dtype=np.int64)
+
+    # defining the initializing function
+    def __init__(self, n, seed=None, width=Tetris.FIELD_WIDTH, height=Tetris.FIELD_HEIGHT):
+        # Number of games
+        self.n = n
+        # Size of every game field
+        self.width, self.height = width, height
+        # Random generator shared by all games of the batch
+        self.rng = np.random.default_rng(seed)
+        # Game fields holding cell colors
+        self.boards = np.zeros((n, height, width), dtype=np.uint8)
+        # Current tetromino shape, rotation and color
+        self.shape = np.zeros(n, dtype=np.int64)
+        self.rotation = np.zeros(n, dtype=np.int64)
+        self.color = np.zeros(n, dtype=np.uint8)
+        # Current tetromino offset
+        self.row = np.zeros(n, dtype=np.int64)
+        self.col = np.zeros(n, dtype=np.int64)
+        # Score, level and total lines eliminated
+        self.score = np.zeros(n, dtype=np.int64)
+        self.level = np.zeros(n, dtype=np.int64)
+        self.total_lines_eliminated = np.zeros(n, dtype=np.int64)
+        # Game over state
+        self.game_over = np.zeros(n, dtype=bool)
+        # Start every game
+        self.reset()
+
+    # defining the reset function
+    def reset(self, mask=None):
+        # Reset all games unless a mask selects some of them
+        idx = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        self.boards[idx] = 0
+        self.score[idx] = 0
+        self.level[idx] = 0
+        self.total_lines_eliminated[idx] = 0
+        self.game_over[idx] = False
+        self.spawn(idx)
+        # Return the observations
+        return self.observe()
+
+    # defining the spawn function
+    def spawn(self, idx):
+        # Choose a random tetromino and color for the selected games
+        self.shape[idx] = self.rng.integers(0, len(Tetris.TETROMINOS), len(idx))
+        self.rotation[idx] = 0
+        self.color[idx] = self.rng.integers(1, len(COLORS), len(idx))
+        # Set initial offset for tetromino
+        self.row[idx] = -2
+        self.col[idx] = self.width // 2
+        # Games whose new tetromino does not fit are over
+        self.game_over[idx] |= ~self.fits(idx, self.rotation[idx], self.row[idx], self.col[idx])
+
+    # defining the cells function
+    def cells(self, idx, rotation, row, col):
+        # Absolute (rows, cols) of the tetromino cells of the selected games, each of shape (k, 4)
+        cells = TetrisBatch.CELLS[self.shape[idx], rotation]
+        return cells[:, :, 0] + row[:, None], cells[:, :, 1] + col[:, None]
+
+    # defining the fits function
+    def fits(self, idx, rotation, row, col):
+        # Check the side walls, the floor and the occupied cells for each selected game
+        rows, cols = self.cells(idx, rotation, row, col)
+        inside = (cols >= 0) & (cols < self.width) & (rows < self.height)
+        occupied = self.boards[idx[:, None],
+                               np.clip(rows, 0, self.height - 1),
+                               np.clip(cols, 0, self.width - 1)] != 0
+        return (inside & ((rows < 0) | ~occupied)).all(axis=1)
+
+    # defining the shift function
+    def shift(self, idx, dr, dc):
+        # Move the selected tetrominos where the move is valid and return the mask of blocked games
+        ok = self.fits(idx, self.rotation[idx], self.row[idx] + dr, self.col[idx] + dc)
+        self.row[idx[ok]] += dr
+        self.col[idx[ok]] += dc
+        return ~ok
+
+    # defining the rotate function
+    def rotate(self, idx):
+        # Look up the next rotation state and its wall-kick offsets
+        rotation = (self.rotation[idx] + 1) % 4
+        kicks = TetrisBatch.KICKS[self.shape[idx], self.rotation[idx]]
+        row, col = self.row[idx], self.col[idx]
+        # Try the wall-kick offsets in order and keep the first valid one
+        pending = np.ones(len(idx), dtype=bool)
+        for test in range(kicks.shape[1]):
+            ok = pending & self.fits(idx, rotation, row + kicks[:, test, 0], col + kicks[:, test, 1])
+            self.rotation[idx[ok]] = rotation[ok]
+            self.row[idx[ok]] = row[ok] + kicks[ok, test, 0]
+            self.col[idx[ok]] = col[ok] + kicks[ok, test, 1]
+            pending &= ~ok
+
+    # defining the lock function
+    def lock(self, idx):
+        # Tetrominos sticking out of the top end the game
+        rows, cols = self.cells(idx, self.rotation[idx], self.row[idx], self.col[idx])
+        over = (rows < 0).any(axis=1)
+        self.game_over[idx[over]] = True
+        idx, rows, cols = idx[~over], rows[~over], cols[~over]
+        # Apply tetromino to game field
+        self.boards[idx[:, None], rows, cols] = self.color[idx, None]
+        # Find the full rows
+        boards = self.boards[idx]
+        full = (boards != 0).all(axis=2)
+        lines_eliminated = full.sum(axis=1)
+        # Move full rows to the top (keeping the order of the others) and clear them
+        order = np.argsort(~full, axis=1, kind='stable')
+        boards = np.take_along_axis(boards, order[:, :, None], axis=1)
+        boards[np.arange(self.height)[None, :] < lines_eliminated[:, None]] = 0
+        self.boards[idx] = boards
+        # Update total lines eliminated, score and level
+        self.total_lines_eliminated[idx] += lines_eliminated
+        self.score[idx] += TetrisBatch.SCORE_PER_ELIMINATED_LINES[lines_eliminated] * (self.level[idx] + 1)
+        self.level[idx] = self.total_lines_eliminated[idx] // 5
+        # Reset tetromino for next move
+        self.spawn(idx)
+
+    # defining the step function
+    def step(self, actions):
+        # Apply one action and one gravity step to every game
+        actions = np.asarray(actions)
+        score = self.score.copy()
+        live = ~self.game_over
+        # Move left or right
+        for action, dc in ((LEFT, -1), (RIGHT, 1)):
+            self.shift(np.flatnonzero(live & (actions == action)), 0, dc)
+        # Rotate
+        self.rotate(np.flatnonzero(live & (actions == ROTATE)))
+        # Drop the tetromino as far as it goes
+        idx = np.flatnonzero(live & (actions == DROP))
+        while len(idx):
+            idx = idx[~self.shift(idx, 1, 0)]
+        # Apply gravity (a soft drop adds one extra row)
+        for extra in (True, False):
+            idx = np.flatnonzero(live & ~self.game_over & ((actions == DOWN) if extra else True))
+            blocked = self.shift(idx, 1, 0)
+            self.lock(idx[blocked])
+        # Collect rewards and finished games, then restart finished games
+        rewards = self.score - score
+        dones = self.game_over.copy()
+        if dones.any():
+            self.reset(dones)
+        return self.observe(), rewards, dones
+
+    # defining the observe function
+    def observe(self):
+        # Copy the fields and draw the visible part of each tetromino on top
+        observations = self.boards.copy()
+        idx = np.arange(self.n)
+        rows, cols = self.cells(idx, self.rotation, self.row, self.col)
+        visible = rows >= 0
+        observations[np.broadcast_to(idx[:, None], rows.shape)[visible], rows[visible],
+                     cols[visible]] = np.broadcast_to(self.color[:, None], rows.shape)[visible]
+        return observations
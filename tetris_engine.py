@@ -0,0 +1,651 @@
+# Import random module for generating random values
+import random
+# Import array for the compact per-column feature arrays
+from array import array
+# Import deque for the placement search queue and namedtuple for its results
+from collections import deque, namedtuple
+
+COLORS = ['gray', 'lightgreen', 'pink', 'blue', 'orange',
+          'purple']         # List of colors for tetrominos
+
+# Action codes accepted by Tetris.play
+NOOP, LEFT, RIGHT, DOWN, ROTATE, DROP = range(6)
+
+# Final position of the current tetromino and the field rows after it locks and lines clear
+Placement = namedtuple(
+    'Placement', ['rotation', 'column', 'row', 'rows', 'lines_eliminated'])
+
+
+# creating a class name snapshot
+class Snapshot(namedtuple(
+        'Snapshot', ['board', 'rng_state', 'bag_pieces', 'shape', 'rotation', 'color', 'offset',
+                     'score', 'level', 'total_lines_eliminated', 'pieces_placed', 'game_over'])):
+    # Immutable state of a game; the board is shared between all snapshots taken while it does
+    # not change. Snapshots compare and hash by position only (field rows and tetromino), so a
+    # transposition table merges positions reached with different scores or upcoming pieces
+    __slots__ = ()
+
+    # defining the position function
+    def position(self):
+        # Field rows, shape, rotation and offset of the tetromino
+        return self.board[0], self.shape, self.rotation, self.offset
+
+    # defining the eq function
+    def __eq__(self, other):
+        return isinstance(other, Snapshot) and self.position() == other.position()
+
+    # defining the ne function
+    def __ne__(self, other):
+        return not self == other
+
+    # defining the hash function
+    def __hash__(self):
+        return hash(self.position())
+
+
+# creating a class name piecerandom
+class PieceRandom:
+    # SplitMix64 generator whose whole state is one 64-bit integer, so snapshots stay small
+
+    # Mask of the 64-bit state
+    MASK = (1 << 64) - 1
+
+    # defining the initializing function
+    def __init__(self, seed=None):
+        # Start from the seed, or from a random seed if none is given
+        self.state = (random.getrandbits(64) if seed is None else seed) & PieceRandom.MASK
+
+    # defining the next function
+    def next(self):
+        # Advance the state and return its next 64 random bits
+        self.state = (self.state + 0x9E3779B97F4A7C15) & PieceRandom.MASK
+        z = self.state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & PieceRandom.MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & PieceRandom.MASK
+        return z ^ (z >> 31)
+
+    # defining the getrandbits function
+    def getrandbits(self, k):
+        # Random integer of k bits (at most 64)
+        return self.next() >> (64 - k)
+
+    # defining the randrange function
+    def randrange(self, n):
+        # Random integer in range(n)
+        return self.next() % n
+
+    # defining the randint function
+    def randint(self, a, b):
+        # Random integer between a and b inclusive
+        return a + self.randrange(b - a + 1)
+
+    # defining the shuffle function
+    def shuffle(self, items):
+        # Shuffle a list in place
+        for i in range(len(items) - 1, 0, -1):
+            j = self.randrange(i + 1)
+            items[i], items[j] = items[j], items[i]
+
+    # defining the getstate function
+    def getstate(self):
+        # Return the state
+        return self.state
+
+    # defining the setstate function
+    def setstate(self, state):
+        # Restore a state returned by getstate
+        self.state = state
+
+# SRS wall-kick tests for J, L, S, T and Z as (x, y) with y pointing up,
+# indexed by the rotation state the clockwise rotation starts from
+SRS_KICKS = (
+    ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),                          # 0 -> R
+    ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),                              # R -> 2
+    ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),                             # 2 -> L
+    ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),                           # L -> 0
+)
+# SRS wall-kick tests for I
+SRS_I_KICKS = (
+    ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),                            # 0 -> R
+    ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),                            # R -> 2
+    ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),                            # 2 -> L
+    ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),                            # L -> 0
+)
+
+
+# defining the rotation_states function
+def rotation_states(tetromino):
+    # Calculate size of tetromino
+    ys = [r for (r, c) in tetromino]
+    xs = [c for (r, c) in tetromino]
+    size = max(max(ys) - min(ys), max(xs)-min(xs))
+    # Rotate the tetromino clockwise three times to collect all four states
+    states = [tuple(tetromino)]
+    for _ in range(3):
+        states.append(tuple((c, size-r) for (r, c) in states[-1]))
+    return tuple(states)
+
+
+# defining the piece_geometry function
+def piece_geometry(tetromino):
+    # Leftmost column and horizontal span of the tetromino
+    left = min(c for (r, c) in tetromino)
+    width = max(c for (r, c) in tetromino) - left + 1
+    # Combine the cells of each tetromino row into one bitmask
+    masks = {}
+    for (r, c) in tetromino:
+        masks[r] = masks.get(r, 0) | (1 << (c - left))
+    # Return the row masks (sorted top to bottom), left column and width
+    return tuple(sorted(masks.items())), left, width
+
+
+# defining the kick_table function
+def kick_table(tetromino):
+    # Calculate size of tetromino
+    ys = [r for (r, c) in tetromino]
+    xs = [c for (r, c) in tetromino]
+    size = max(max(ys) - min(ys), max(xs)-min(xs))
+    # The O tetromino looks the same in every state and never kicks
+    if size == 1:
+        return (((0, 0),),) * 4
+    # Convert the SRS (x, y) tests into (row, column) offsets; the tetrominos spawn in the
+    # SRS L state, so rotating from state i uses the SRS tests of state (i + 3) % 4
+    kicks = SRS_I_KICKS if size == 3 else SRS_KICKS
+    return tuple(tuple((-y, x) for (x, y) in kicks[(i + 3) % 4]) for i in range(4))
+
+
+# defining the column_bottoms function
+def column_bottoms(tetromino):
+    # Lowest tetromino row in each of its columns
+    bottoms = {}
+    for (r, c) in tetromino:
+        bottoms[c] = max(r, bottoms.get(c, r))
+    return tuple(sorted(bottoms.items()))
+
+
+# defining the remove_rows function
+def remove_rows(columns, full_rows):
+    # Remove each run of adjacent full rows (sorted top down) from column bitmasks, shifting the rows above them
+    first = 0
+    while first < len(full_rows):
+        last = first
+        while last + 1 < len(full_rows) and full_rows[last + 1] == full_rows[last] + 1:
+            last += 1
+        top, bottom, count = full_rows[first], full_rows[last] + 1, last - first + 1
+        above = (1 << top) - 1
+        columns = [((column & above) << count) | (column >> bottom << bottom)
+                   for column in columns]
+        first = last + 1
+    return columns
+
+
+# defining the column_features function
+def column_features(column, height):
+    # Height of a column bitmask and number of empty cells under its top filled cell
+    if not column:
+        return 0, 0
+    top = height - (column & -column).bit_length() + 1
+    return top, top - bin(column).count('1')
+
+
+class Tetris():
+    # Height of the game field
+    FIELD_HEIGHT = 20
+    # Width of the game field
+    FIELD_WIDTH = 10
+    # Scores for eliminating lines
+    # Tetrominos represented as a list of coordinates
+    SCORE_PER_ELIMINATED_LINES = (0, 40, 100, 300, 1200)
+    TETROMINOS = [
+        [(0, 0), (0, 1), (1, 0), (1, 1)],                                   # O
+        [(0, 0), (0, 1), (1, 1), (2, 1)],                                   # L
+        [(0, 1), (1, 1), (2, 1), (2, 0)],                                   # J
+        [(0, 1), (1, 0), (1, 1), (2, 0)],                                   # Z
+        [(0, 1), (1, 0), (1, 1), (2, 1)],                                   # T
+        [(0, 0), (1, 0), (1, 1), (2, 1)],                                   # S
+        [(0, 1), (1, 1), (2, 1), (3, 1)],                                   # I
+    ]
+
+    # Cells of every (shape, rotation) pair
+    ROTATIONS = tuple(rotation_states(t) for t in TETROMINOS)
+    # Row masks, left column and width of every (shape, rotation) pair
+    GEOMETRY = tuple(tuple(piece_geometry(s) for s in states)
+                     for states in ROTATIONS)
+    # Wall-kick offsets tried, in order, when rotating from each (shape, rotation) pair
+    KICKS = tuple(kick_table(t) for t in TETROMINOS)
+    # (column, lowest row) pairs of every (shape, rotation) pair, used for hard drops
+    BOTTOMS = tuple(tuple(column_bottoms(s) for s in states)
+                    for states in ROTATIONS)
+
+    # defining the initializing function
+    def __init__(self, seed=None, bag=False, width=FIELD_WIDTH, height=FIELD_HEIGHT):
+        # Set the size of the game field
+        self.width, self.height = width, height
+        # Bitmask of a completely filled row (bit c set = column c occupied)
+        self.full_row = (1 << width) - 1
+        # Create the game's own random generator
+        self.rng = PieceRandom(seed)
+        # Draw tetrominos from shuffled bags of all seven shapes if requested
+        self.bag = bag
+        self.bag_pieces = []
+        # Initialize game field as one occupancy bitmask per row
+        self.rows = [0] * self.height
+        # Initialize cell colors as a compact row-major byte array
+        self.colors = bytearray(self.height * self.width)
+        # Initialize the transposed field as one occupancy bitmask per column (bit r = row r)
+        self.columns = [0] * self.width
+        # Initialize the heights and holes of every column and their aggregates
+        self.heights = array('H', bytes(2 * self.width))
+        self.holes = array('H', bytes(2 * self.width))
+        self.aggregate_height = 0
+        self.hole_count = 0
+        self.bumpiness = 0
+        # Frozen board, reused by snapshots until it changes
+        self.frozen_board = None
+        # Initialize score
+        self.score = 0
+        # Initialize level
+        self.level = 0
+        # Initialize total lines eliminated
+        self.total_lines_eliminated = 0
+        # Initialize number of tetrominos placed
+        self.pieces_placed = 0
+        # Initialize game over state
+        self.game_over = False
+        # Reset tetromino to start the game
+        self.reset_tetromino()
+
+    # defining the field property
+    @property
+    def field(self):
+        # Expand the bitboard colors into the list-of-lists view of the field
+        width = self.width
+        return [list(self.colors[r*width:(r+1)*width]) for r in range(self.height)]
+
+    # defining the set_tetromino function
+    def set_tetromino(self, shape, rotation):
+        # Set the tetromino shape and rotation state
+        self.shape, self.rotation = shape, rotation
+        # Look up the tetromino cells
+        self.tetromino = Tetris.ROTATIONS[shape][rotation]
+        # Look up the row masks used for collision tests
+        self.tetromino_masks, self.tetromino_left, self.tetromino_width = Tetris.GEOMETRY[
+            shape][rotation]
+
+    # defining the reset_tetromino
+    def reset_tetromino(self):
+        # Refill the bag with a shuffled set of all tetrominos when it runs out
+        if self.bag and not self.bag_pieces:
+            self.bag_pieces = list(range(len(Tetris.TETROMINOS)))
+            self.rng.shuffle(self.bag_pieces)
+        # Choose a random tetromino
+        self.set_tetromino(self.bag_pieces.pop() if self.bag else self.rng.randrange(
+            len(Tetris.TETROMINOS)), 0)
+        # Choose a random color for tetromino
+        self.tetromino_color = self.rng.randint(1, len(COLORS)-1)
+        # Set initial offset for tetromino
+        self.tetromino_offset = [-2, self.width//2]
+        # Check if game over
+        self.game_over = not self.fits(*self.tetromino_offset)
+
+    # defining the get_tetromino_coords
+    def get_tetromino_coords(self):
+        # Get coordinates of current tetromino
+        return [(r+self.tetromino_offset[0], c + self.tetromino_offset[1]) for (r, c) in self.tetromino]
+
+    # defining the fits function
+    def fits(self, row, col, geometry=None):
+        # Use the current tetromino unless another geometry is given
+        masks, left, width = geometry or (
+            self.tetromino_masks, self.tetromino_left, self.tetromino_width)
+        # Bit position of the leftmost tetromino column
+        shift = col + left
+        # Check the side walls
+        if shift < 0 or shift + width > self.width:
+            return False
+        for (r, mask) in masks:
+            r += row
+            # Check the floor
+            if r >= self.height:
+                return False
+            # Check the occupied cells (rows above the field are always free)
+            if r >= 0 and self.rows[r] & (mask << shift):
+                return False
+        return True
+
+    def apply_tetromino(self):
+        # Get the tetromino position
+        row, col = self.tetromino_offset
+        shift = col + self.tetromino_left
+        width = self.width
+        # Apply tetromino to game field
+        for (r, mask) in self.tetromino_masks:
+            r += row
+            self.rows[r] |= mask << shift
+        for (r, c) in self.get_tetromino_coords():
+            self.colors[r*width + c] = self.tetromino_color
+            self.columns[c] |= 1 << r
+        # Find the full rows among the rows touched by the tetromino
+        full_rows = [r + row for (r, mask) in self.tetromino_masks
+                     if self.rows[r + row] == self.full_row]
+        # Calculate lines eliminated
+        lines_eliminated = len(full_rows)
+        # Remove the full rows from the bottom up so indices stay valid
+        for r in reversed(full_rows):
+            del self.rows[r]
+            del self.colors[r*width:(r+1)*width]
+        # Refill the top of the game field with empty rows
+        self.rows[0:0] = [0] * lines_eliminated
+        self.colors[0:0] = bytes(lines_eliminated * width)
+        # The board changed
+        self.frozen_board = None
+        # Remove the full rows from the columns
+        if lines_eliminated:
+            self.columns = remove_rows(self.columns, full_rows)
+            # Every column may have changed height
+            self.update_features(range(width))
+        else:
+            # Only the columns under the tetromino changed
+            self.update_features([c + col for (c, r) in Tetris.BOTTOMS[self.shape][self.rotation]])
+        # Update total lines eliminated
+        self.total_lines_eliminated += lines_eliminated
+        # Update score
+        self.score += Tetris.SCORE_PER_ELIMINATED_LINES[lines_eliminated] * (
+            self.level + 1)
+        # Update level
+        self.level = self.total_lines_eliminated // 5
+        # Update number of tetrominos placed
+        self.pieces_placed += 1
+        # Reset tetromino for next move
+        self.reset_tetromino()
+
+    # defining the update_features function
+    def update_features(self, changed):
+        # Recalculate the height and holes of the changed columns and adjust the aggregates
+        heights, holes = self.heights, self.holes
+        for c in changed:
+            height, hole_count = column_features(self.columns[c], self.height)
+            self.hole_count += hole_count - holes[c]
+            holes[c] = hole_count
+            old = heights[c]
+            if height != old:
+                # Bumpiness only changes next to the column
+                for n in (c - 1, c + 1):
+                    if 0 <= n < self.width:
+                        self.bumpiness += abs(height - heights[n]) - abs(old - heights[n])
+                self.aggregate_height += height - old
+                heights[c] = height
+
+    # defining the column_heights property
+    @property
+    def column_heights(self):
+        # Read-only view of the height of every column
+        return memoryview(self.heights).toreadonly()
+
+    # defining the column_holes property
+    @property
+    def column_holes(self):
+        # Read-only view of the number of holes in every column
+        return memoryview(self.holes).toreadonly()
+
+    # defining the features function
+    def features(self):
+        # Aggregate height, holes and bumpiness of the field
+        return self.aggregate_height, self.hole_count, self.bumpiness
+
+    # defining the placement_features function
+    def placement_features(self, placement):
+        # Aggregate height, holes and bumpiness of the field after a placement, without applying it
+        shape, row, col = self.shape, placement.row, placement.column
+        # Filled cells of the tetromino in each column it covers
+        cells = {}
+        for (r, c) in Tetris.ROTATIONS[shape][placement.rotation]:
+            cells[c + col] = cells.get(c + col, 0) | 1 << (r + row)
+        # Line clears can move every column, so rebuild the features of the whole field
+        if placement.lines_eliminated:
+            columns = self.columns[:]
+            rows = set()
+            for c, bits in cells.items():
+                columns[c] |= bits
+                while bits:
+                    rows.add((bits & -bits).bit_length() - 1)
+                    bits &= bits - 1
+            full_rows = sorted(r for r in rows if all(column >> r & 1 for column in columns))
+            features = [column_features(column, self.height)
+                        for column in remove_rows(columns, full_rows)]
+            heights = [height for (height, holes) in features]
+            return (sum(heights), sum(holes for (height, holes) in features),
+                    sum(abs(a - b) for a, b in zip(heights, heights[1:])))
+        # Otherwise only the covered columns change
+        aggregate_height, hole_count = self.aggregate_height, self.hole_count
+        heights = {}
+        for c, bits in cells.items():
+            height, holes = column_features(self.columns[c] | bits, self.height)
+            aggregate_height += height - self.heights[c]
+            hole_count += holes - self.holes[c]
+            heights[c] = height
+        # Adjust the bumpiness of the column pairs next to the covered columns
+        bumpiness = self.bumpiness
+        for c in {n for c in cells for n in (c - 1, c) if 0 <= n < self.width - 1}:
+            bumpiness += (abs(heights.get(c, self.heights[c]) - heights.get(c + 1, self.heights[c + 1]))
+                          - abs(self.heights[c] - self.heights[c + 1]))
+        return aggregate_height, hole_count, bumpiness
+
+    # defining the snapshot function
+    def snapshot(self):
+        # Freeze the board (rows, colors, columns and column features) once per locked tetromino
+        if self.frozen_board is None:
+            self.frozen_board = (tuple(self.rows), bytes(self.colors), tuple(self.columns),
+                                 tuple(self.heights), tuple(self.holes),
+                                 self.aggregate_height, self.hole_count, self.bumpiness)
+        # Combine it with the random generator state, the tetromino and the scalars
+        return Snapshot(self.frozen_board, self.rng.getstate(), tuple(self.bag_pieces), self.shape,
+                        self.rotation, self.tetromino_color, tuple(self.tetromino_offset),
+                        self.score, self.level, self.total_lines_eliminated, self.pieces_placed,
+                        self.game_over)
+
+    # defining the restore function
+    def restore(self, snapshot):
+        # Rebuild the board from a snapshot taken from a game of the same size
+        (rows, colors, columns, heights, holes,
+         self.aggregate_height, self.hole_count, self.bumpiness) = snapshot.board
+        self.rows, self.colors, self.columns = list(rows), bytearray(colors), list(columns)
+        self.heights, self.holes = array('H', heights), array('H', holes)
+        # Restore the random generator and the bag
+        self.rng.setstate(snapshot.rng_state)
+        self.bag_pieces = list(snapshot.bag_pieces)
+        # Keep sharing the frozen board with the snapshot
+        self.frozen_board = snapshot.board
+        # Restore the tetromino
+        self.set_tetromino(snapshot.shape, snapshot.rotation)
+        self.tetromino_color = snapshot.color
+        self.tetromino_offset = list(snapshot.offset)
+        # Restore the scalars
+        self.score, self.level = snapshot.score, snapshot.level
+        self.total_lines_eliminated = snapshot.total_lines_eliminated
+        self.pieces_placed, self.game_over = snapshot.pieces_placed, snapshot.game_over
+
+    # defining the get_colorfunction
+    def get_color(self, r, c):
+        # Get the tetromino position
+        row, col = self.tetromino_offset
+        # Check if the cell is covered by the tetromino
+        for (pr, mask) in self.tetromino_masks:
+            if pr + row == r:
+                if (mask << (col + self.tetromino_left)) >> c & 1:
+                    return self.tetromino_color
+                break
+        # Get color of cell
+        return self.colors[r*self.width + c]
+
+    # defining the is_cell_free function
+    def is_cell_free(self, r, c):
+        # Check if cell is free
+        return r < self.height and 0 <= c < self.width and (r < 0 or not self.rows[r] >> c & 1)
+
+    # defining the move function
+    def move(self, dr, dc):
+        # Check if game over
+        if self.game_over:
+            return
+        # Check if move is valid
+        if self.fits(self.tetromino_offset[0] + dr, self.tetromino_offset[1] + dc):
+            # Update tetromino offset
+            self.tetromino_offset = [
+                self.tetromino_offset[0] + dr, self.tetromino_offset[1] + dc]
+        # If move is downwards
+        elif dr == 1 and dc == 0:
+            # Check if game over
+            self.game_over = self.tetromino_offset[0] + \
+                self.tetromino_masks[0][0] < 0
+            # If game is not over
+            if not self.game_over:
+                # Apply tetromino to game field
+                self.apply_tetromino()
+
+    # defining the play function
+    def play(self, action):
+        # Apply one action code
+        if action == LEFT:
+            self.move(0, -1)
+        elif action == RIGHT:
+            self.move(0, 1)
+        elif action == DOWN:
+            self.move(1, 0)
+        elif action == ROTATE:
+            self.rotate()
+        elif action == DROP:
+            self.hard_drop()
+
+    # defining the drop_distance function
+    def drop_distance(self):
+        # Get the tetromino position
+        row, col = self.tetromino_offset
+        # Rows the tetromino can fall, limited by the floor or the first filled cell under each column
+        distance = self.height
+        for (c, r) in Tetris.BOTTOMS[self.shape][self.rotation]:
+            r += row + 1
+            below = self.columns[c + col]
+            below = below >> r if r >= 0 else below << -r
+            distance = min(distance, (below & -below).bit_length() -
+                           1 if below else self.height - r)
+        return distance
+
+    # defining the ghost_piece function
+    def ghost_piece(self):
+        # Get coordinates where the tetromino would land
+        row = self.tetromino_offset[0] + self.drop_distance()
+        return [(r + row, c + self.tetromino_offset[1]) for (r, c) in self.tetromino]
+
+    # defining the hard_drop function
+    def hard_drop(self):
+        # Check if game over
+        if self.game_over:
+            return
+        # Move the tetromino to its landing row
+        self.tetromino_offset = [
+            self.tetromino_offset[0] + self.drop_distance(), self.tetromino_offset[1]]
+        # Check if game over
+        self.game_over = self.tetromino_offset[0] + \
+            self.tetromino_masks[0][0] < 0
+        # If game is not over
+        if not self.game_over:
+            # Apply tetromino to game field
+            self.apply_tetromino()
+
+    # defining the placements function
+    def placements(self):
+        # Check if game over
+        if self.game_over:
+            return []
+        shape = self.shape
+        # Layout of the visited bitset, one bit per (rotation, row, column) state
+        stride = self.width + 8
+        plane = (self.height + 16) * stride
+        # Start the search from the current tetromino state
+        row, col = self.tetromino_offset
+        visited = 1 << (self.rotation*plane + (row + 8)*stride + col + 4)
+        queue = deque([(self.rotation, row, col)])
+        # Footprints of the placements found so far
+        seen = set()
+        placements = []
+        while queue:
+            rotation, row, col = queue.popleft()
+            geometry = Tetris.GEOMETRY[shape][rotation]
+            # Collect the states reachable by moving left, right or down
+            moves = [(rotation, row, col + dc) for dc in (-1, 1)
+                     if self.fits(row, col + dc, geometry)]
+            if self.fits(row + 1, col, geometry):
+                moves.append((rotation, row + 1, col))
+            # If the tetromino cannot move down it lands here
+            else:
+                masks, left, width = geometry
+                footprint = tuple((r + row, mask << (col + left))
+                                  for (r, mask) in masks)
+                # Skip duplicate footprints and placements that end the game
+                if footprint[0][0] >= 0 and footprint not in seen:
+                    seen.add(footprint)
+                    # Apply the tetromino to a copy of the row bitmasks
+                    rows = self.rows[:]
+                    for (r, mask) in footprint:
+                        rows[r] |= mask
+                    # Eliminate full rows
+                    kept = [r for r in rows if r != self.full_row]
+                    lines_eliminated = len(rows) - len(kept)
+                    placements.append(Placement(
+                        rotation, col, row, (0,) * lines_eliminated + tuple(kept), lines_eliminated))
+            # Collect the state reachable by rotating, trying the wall-kick offsets in order
+            rotated = Tetris.GEOMETRY[shape][(rotation + 1) % 4]
+            for (dr, dc) in Tetris.KICKS[shape][rotation]:
+                if self.fits(row + dr, col + dc, rotated):
+                    moves.append(((rotation + 1) % 4, row + dr, col + dc))
+                    break
+            # Queue the states not visited yet
+            for state in moves:
+                bit = 1 << (state[0]*plane + (state[1] + 8)*stride + state[2] + 4)
+                if not visited & bit:
+                    visited |= bit
+                    queue.append(state)
+        return placements
+
+    # defining the apply_placement function
+    def apply_placement(self, placement):
+        # Check the placement before changing any state
+        if self.game_over:
+            raise ValueError("the game is over")
+        if placement.rotation not in range(4):
+            raise ValueError("invalid rotation {}".format(placement.rotation))
+        geometry = Tetris.GEOMETRY[self.shape][placement.rotation]
+        row, col = placement.row, placement.column
+        # The tetromino must fit, rest on the floor or on filled cells and lie inside the field
+        if not self.fits(row, col, geometry):
+            raise ValueError("placement {} does not fit".format((row, col)))
+        if self.fits(row + 1, col, geometry):
+            raise ValueError("placement {} is not resting on anything".format((row, col)))
+        if row + geometry[0][0][0] < 0:
+            raise ValueError("placement {} is above the field".format((row, col)))
+        # Move the tetromino to the placement and lock it
+        self.set_tetromino(self.shape, placement.rotation)
+        self.tetromino_offset = [placement.row, placement.column]
+        self.apply_tetromino()
+
+    # defining the rotate function
+    def rotate(self):
+        # If game over
+        if self.game_over:
+            # Reset game with a seed drawn from this game so restarts stay reproducible
+            self.__init__(self.rng.getrandbits(64), self.bag, self.width, self.height)
+            return
+
+        # Look up the next rotation state
+        rotation = (self.rotation + 1) % 4
+        geometry = Tetris.GEOMETRY[self.shape][rotation]
+        row, col = self.tetromino_offset
+        # Try the wall-kick offsets in order
+        for (dr, dc) in Tetris.KICKS[self.shape][self.rotation]:
+            # Check if move is valid
+            if self.fits(row + dr, col + dc, geometry):
+                # Update tetromino and offset
+                self.set_tetromino(self.shape, rotation)
+                self.tetromino_offset = [row + dr, col + dc]
+                return